@@ -8,11 +8,10 @@ class Problem(AOCProblem):
 
     def __init__(self, test=False):
         super().__init__(dunder_file_child=__file__, test=test)
-        self.lines = []
+        self.calories = []
 
     def load_data(self, f):
-        with f.open() as f_in:
-            self.lines = f_in.readlines()
+        self.calories = [sum(int(line) for line in block) for block in self.iter_blocks(f)]
 
     def solve1(self):
         return self._solve(n_largest=1)
@@ -20,21 +19,14 @@ class Problem(AOCProblem):
     def solve2(self):
         return self._solve(n_largest=3)
 
-    def _solve(self, n_largest):
-        heap = []
-
-        ei = 0
-
-        for line_raw in self.lines:
+    def solve_both(self, f):
+        """Only the top three are kept, as the elves stream by"""
+        top_calories = heapq.nlargest(3, (sum(int(line) for line in block) for block in self.iter_blocks(f)))
 
-            if line := line_raw.strip():
-                ei += int(line)
+        return top_calories[0], sum(top_calories)
 
-            else:
-                heapq.heappush(heap, ei)
-                ei = 0
-
-        return sum(heapq.nlargest(n_largest, heap))
+    def _solve(self, n_largest):
+        return sum(heapq.nlargest(n_largest, self.calories))
 
 
 if __name__ == '__main__':
@@ -1,14 +1,7 @@
 from enum import Enum
-from io import StringIO
 from pathlib import Path
 
-N = 2
-
-TEST = False
-
-IN = Path('in') / f'{N:02d}.txt'
-
-IN_TEST = StringIO('A Y\nB X\nC Z')
+from lib import AOCProblem, echo, output
 
 
 class WhatToDo(Enum):
@@ -49,61 +42,69 @@ def rate_score(opponent: RPC, mine: RPC):
     return wdl + mine.score
 
 
-def solve():
-    buffer = IN_TEST if TEST else IN.open()
+class Problem(AOCProblem):
+    N = 2
+
+    def __init__(self, **kwargs):
+        super().__init__(dunder_file_child=__file__, **kwargs)
+        self.plays = []
 
-    with buffer as f:
-        plays = [line.strip().split(' ') for line in f.readlines()]
+    def load_data(self, f: Path):
+        self.plays = [line.strip().split(' ') for line in self.iter_lines(f) if line.strip()]
 
-    score = n = 0
-    for opponent_c, mine_c in plays:
-        opponent = RPC.from_opponent_choice(opponent_c)
-        mine = RPC.from_my_choice(mine_c)
+    def solve1(self):
+        score = 0
+        echoing = output.enabled  # Not to build the lines of every round when they go nowhere
+        for n, (opponent_c, mine_c) in enumerate(self.plays):
+            opponent = RPC.from_opponent_choice(opponent_c)
+            mine = RPC.from_my_choice(mine_c)
 
-        round_score = rate_score(opponent, mine)
-        score += round_score
+            round_score = rate_score(opponent, mine)
+            score += round_score
 
-        print(f'{n:4}. {opponent:8} v. {mine:8} =  {round_score}')
-        n += 1
+            if echoing:
+                echo(f'{n:4}. {opponent:8} v. {mine:8} =  {round_score}')
 
-    print('First star result:', score)
+        return score
 
-    score = n = 0
-    for opponent_c, what_to_do_c in plays:
-        opponent = RPC.from_opponent_choice(opponent_c)
-        what_to_do = WhatToDo(what_to_do_c)
+    def solve2(self):
+        score = 0
+        echoing = output.enabled
+        for n, (opponent_c, what_to_do_c) in enumerate(self.plays):
+            opponent = RPC.from_opponent_choice(opponent_c)
+            what_to_do = WhatToDo(what_to_do_c)
 
-        mine = None
+            mine = None
 
-        if what_to_do == WhatToDo.DRAW:
-            mine = opponent
+            if what_to_do == WhatToDo.DRAW:
+                mine = opponent
 
-        elif what_to_do == WhatToDo.WIN:
-            if opponent == RPC.ROCK:
-                mine = RPC.PAPER
-            elif opponent == RPC.PAPER:
-                mine = RPC.SCISSORS
-            elif opponent == RPC.SCISSORS:
-                mine = RPC.ROCK
-        elif what_to_do == WhatToDo.LOSE:
-            if opponent == RPC.ROCK:
-                mine = RPC.SCISSORS
-            elif opponent == RPC.PAPER:
-                mine = RPC.ROCK
-            elif opponent == RPC.SCISSORS:
-                mine = RPC.PAPER
+            elif what_to_do == WhatToDo.WIN:
+                if opponent == RPC.ROCK:
+                    mine = RPC.PAPER
+                elif opponent == RPC.PAPER:
+                    mine = RPC.SCISSORS
+                elif opponent == RPC.SCISSORS:
+                    mine = RPC.ROCK
+            elif what_to_do == WhatToDo.LOSE:
+                if opponent == RPC.ROCK:
+                    mine = RPC.SCISSORS
+                elif opponent == RPC.PAPER:
+                    mine = RPC.ROCK
+                elif opponent == RPC.SCISSORS:
+                    mine = RPC.PAPER
 
-        if mine is None:
-            raise RuntimeError('Algo Problem!')
+            if mine is None:
+                raise RuntimeError('Algo Problem!')
 
-        round_score = rate_score(opponent, mine)
-        score += round_score
+            round_score = rate_score(opponent, mine)
+            score += round_score
 
-        print(f'{n:4}. ({what_to_do}) {opponent:8} v. {mine:8} =  {round_score}')
-        n += 1
+            if echoing:
+                echo(f'{n:4}. ({what_to_do}) {opponent:8} v. {mine:8} =  {round_score}')
 
-    print('Second star result:', score)
+        return score
 
 
 if __name__ == '__main__':
-    solve()
+    Problem()()
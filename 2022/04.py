@@ -1,21 +1,6 @@
 import dataclasses
-from io import StringIO
-from pathlib import Path
 
-N = 4
-
-TEST = False
-
-IN = Path('in') / f'{N:02d}.txt'
-IN.touch()
-
-IN_TEST = StringIO(
-    '''2-4,6-8
-2-3,4-5
-5-7,7-9
-2-8,3-7
-6-6,4-6
-2-6,4-8''')
+from lib import AOCProblem
 
 
 @dataclasses.dataclass
@@ -37,38 +22,57 @@ class Interval:
             return True
         return False
 
+    @classmethod
+    def from_str(cls, interval_str: str) -> 'Interval':
+        return cls(*(int(x) for x in interval_str.split('-')))
+
     def __str__(self):
         return f'I({self.left:2d}, {self.right:2d})'
 
 
-def solve():
-    buffer = IN_TEST if TEST else IN.open()
+class Problem(AOCProblem):
+    N = 4
+
+    def __init__(self, test=False):
+        super().__init__(dunder_file_child=__file__, test=test)
+        self.pairs = []
+
+    def load_data(self, f):
+        self.pairs = [self._parse_pair(line) for line in self.iter_lines(f) if line.strip()]
+
+    @staticmethod
+    def _parse_pair(line: str) -> tuple[Interval, Interval]:
+        interval1, interval2 = (Interval.from_str(interval_str) for interval_str in line.strip().split(','))
+        return interval1, interval2
+
+    @staticmethod
+    def _nested(interval1: Interval, interval2: Interval) -> bool:
+        return interval1.contains(interval2) or interval2.contains(interval1)
+
+    def solve1(self):
+        return sum(self._nested(*pair) for pair in self.pairs)
 
-    intervals = []
-    with buffer as f:
-        for line in f.readlines():
-            for interval_str in line.strip().split(','):
-                intervals.append(Interval(*(int(x) for x in interval_str.split('-'))))
+    def solve2(self):
+        return sum(self._nested(*pair) or pair[0].overlaps(pair[1]) for pair in self.pairs)
 
-    count_subintervals = count_overlapping = 0
+    def solve_both(self, f):
+        count_subintervals = count_overlapping = 0
 
-    for couple_idx in range(len(intervals) // 2):
-        i = couple_idx * 2
-        j = i + 1
+        for line in self.iter_lines(f):
+            if not line.strip():
+                continue
 
-        interval1 = intervals[i]
-        interval2 = intervals[j]
+            interval1, interval2 = self._parse_pair(line)
 
-        if interval1.contains(interval2) or interval2.contains(interval1):
-            count_subintervals += 1
-            count_overlapping += 1
+            if self._nested(interval1, interval2):
+                count_subintervals += 1
+                count_overlapping += 1
 
-        elif interval1.overlaps(interval2):
-            count_overlapping += 1
+            elif interval1.overlaps(interval2):
+                count_overlapping += 1
 
-    print('First star result:', count_subintervals)
-    print('Second star result:', count_overlapping )
+        return count_subintervals, count_overlapping
 
 
 if __name__ == '__main__':
-    solve()
+    Problem()()
@@ -2,7 +2,7 @@ from pathlib import Path
 from queue import LifoQueue
 from typing import Dict
 
-from lib import AOCProblem
+from lib import AOCProblem, echo
 
 
 class Problem(AOCProblem):
@@ -49,17 +49,16 @@ class Problem(AOCProblem):
             return super().__str__() + f' (file, size={self.size})'
 
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        super().__init__(__file__, *args, **kwargs)
         self.dirs = []
         self.commands = []
         self.root = self.Dir()
         self.cwd = self.root  # type: Problem.Dir
 
     def load_data(self, f: Path):
-        with f.open() as buffer:
-            for line in buffer.readlines():
-                segments = line.split()
-                self.commands.append(segments)
+        for line in self.iter_lines(f):
+            segments = line.split()
+            self.commands.append(segments)
 
         for line in self.commands:
             if line[0] == self.PROMPT:
@@ -78,7 +77,7 @@ class Problem(AOCProblem):
                     self.cwd = new_path
                     continue
 
-                print(f'UNKNOWN COMMAND {line[1]}')
+                echo(f'UNKNOWN COMMAND {line[1]}')
                 continue
 
             item_name = line[1]
@@ -89,22 +88,11 @@ class Problem(AOCProblem):
 
             self.cwd.children[item_name] = item
 
+    def precompute(self):
         self._load_dir_sizes()
+        self._collect_dirs()
 
     def solve1(self):
-
-        inspect_q = LifoQueue()
-        inspect_q.put_nowait(self.root)
-
-        while not inspect_q.empty():
-            item = inspect_q.get_nowait()
-
-            if isinstance(item, self.Dir):
-                self.dirs.append(item)
-
-                for child_name, child in item.children.items():
-                    inspect_q.put_nowait(child)
-
         small_dirs = [d for d in self.dirs if d.content_size <= self.SIZE_THR]
 
         return sum(d.content_size for d in small_dirs)
@@ -141,6 +129,19 @@ class Problem(AOCProblem):
                     item.parent.content_size += this_size
                     item = item.parent
 
+    def _collect_dirs(self):
+        inspect_q = LifoQueue()
+        inspect_q.put_nowait(self.root)
+
+        while not inspect_q.empty():
+            item = inspect_q.get_nowait()
+
+            if isinstance(item, self.Dir):
+                self.dirs.append(item)
+
+                for child_name, child in item.children.items():
+                    inspect_q.put_nowait(child)
+
     def _print(self):
 
         inspect_q = LifoQueue()
@@ -16,15 +16,14 @@ class Problem(AOCProblem):
         V = 'vertical'
 
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        super().__init__(dunder_file_child=__file__, **kwargs)
         self.forest = []
         self.dim = 0
         self.visible_trees = set()
 
     def load_data(self, f: Path):
-        with f.open() as buffer:
-            for line in buffer.readlines():
-                self.forest.append(list(map(int, line.strip())))
+        for line in self.iter_lines(f):
+            self.forest.append(list(map(int, line.strip())))
 
         self.dim = len(self.forest)
 
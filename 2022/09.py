@@ -1,16 +1,21 @@
 from pathlib import Path
 
-from lib import AOCProblem, Direction2D, Coordinate2D
+from lib import AOCProblem, Direction2D, GridRenderer, Position2D, echo, output
 
 
 class Problem(AOCProblem):
     N = 9
 
+    ORIGIN = Position2D(0, 0)
+
+    # Squares drawn around the head in every frame of the animation, room enough for the whole 10 knots rope
+    FRAME_RADIUS = 10
+
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        super().__init__(dunder_file_child=__file__, **kwargs)
         self.movements = []
         self._knots = []
-        self._tail_histo = {Coordinate2D()}
+        self._tail_histo = {self.ORIGIN}
 
     @property
     def head(self):
@@ -21,10 +26,9 @@ class Problem(AOCProblem):
         return self._knots[-1]
 
     def load_data(self, f: Path):
-        with f.open() as buffer:
-            for line in buffer.readlines():
-                segments = line.split()
-                self.movements.append((Direction2D[segments[0]], int(segments[1])))
+        for line in self.iter_lines(f):
+            segments = line.split()
+            self.movements.append((Direction2D[segments[0]], int(segments[1])))
 
     def solve1(self):
         return self._solve()
@@ -33,14 +37,19 @@ class Problem(AOCProblem):
         return self._solve(n_knots=10)
 
     def _solve(self, n_knots=2):
-        self._knots = [Coordinate2D()] * n_knots
+        self._knots = [self.ORIGIN] * n_knots
         self._tail_histo = {self.tail}
 
+        renderer = GridRenderer() if output.animating else None
+
         for direction, amount in self.movements:
             for _ in range(amount):
                 self._knots[0] += direction
                 self._make_tail_follow_head()
 
+                if renderer:
+                    echo(renderer.redraw(self._rows(around_head=self.FRAME_RADIUS)), end='')
+
         self._plot()
 
         return len(self._tail_histo)
@@ -59,34 +68,37 @@ class Problem(AOCProblem):
         self._tail_histo.add(self.tail)
 
     def _plot(self):
-        y0 = min(0, *[c.y for c in self._knots], *[c.y for c in self._tail_histo])
-        yf = max(0, *[c.y for c in self._knots], *[c.y for c in self._tail_histo])
-        x0 = min(0, *[c.x for c in self._knots], *[c.x for c in self._tail_histo])
-        xf = max(0, *[c.x for c in self._knots], *[c.x for c in self._tail_histo])
-
-        print('-' * (xf - x0 + 1))
-        for y in range(y0, yf + 1):
-            for x in range(x0, xf + 1):
-                c = self._find_c(y, x)
-                print(c, end='')
-
-            print()
-
-    def _find_c(self, y, x):
-        p = Coordinate2D(y, x)
-
-        for i, knot in enumerate(self._knots):
-            if p == knot:
-                if i == 0:
-                    return 'H'
-                return str(i)
-
-        if p in self._tail_histo:
-            return '#'
-
-        if y or x:
-            return '.'
-        return 's'
+        if not output.enabled:
+            return
+
+        rows = self._rows()
+        echo('-' * len(rows[0]))
+        echo(GridRenderer().frame(rows))
+
+    def _rows(self, around_head: int = None) -> list[list[str]]:
+        """The knots over the positions the tail visited, from the start (s) to the furthest ones. Given around_head,
+        only the squares that close to the head, as animation frames do, so that a frame costs the same at any step"""
+        if around_head is None:
+            y0 = min(0, *[c.y for c in self._knots], *[c.y for c in self._tail_histo])
+            yf = max(0, *[c.y for c in self._knots], *[c.y for c in self._tail_histo])
+            x0 = min(0, *[c.x for c in self._knots], *[c.x for c in self._tail_histo])
+            xf = max(0, *[c.x for c in self._knots], *[c.x for c in self._tail_histo])
+            visited = self._tail_histo
+        else:
+            y0, yf = self.head.y - around_head, self.head.y + around_head
+            x0, xf = self.head.x - around_head, self.head.x + around_head
+            visited = [pos for pos in (Position2D(y, x) for y in range(y0, yf + 1) for x in range(x0, xf + 1))
+                       if pos in self._tail_histo]
+
+        rows = [['.'] * (xf - x0 + 1) for _ in range(y0, yf + 1)]
+        if y0 <= 0 <= yf and x0 <= 0 <= xf:
+            rows[-y0][-x0] = 's'
+        for c in visited:
+            rows[c.y - y0][c.x - x0] = '#'
+        for i, knot in reversed(list(enumerate(self._knots))):  # The first knots are drawn over the ones behind them
+            rows[knot.y - y0][knot.x - x0] = str(i) if i else 'H'
+
+        return rows
 
     def __str__(self):
         return '\n'.join((' '.join(str(x) for x in row) for row in self.movements))
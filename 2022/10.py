@@ -12,7 +12,7 @@ class Problem(AOCProblem):
         ADDX = auto()
 
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        super().__init__(dunder_file_child=__file__, **kwargs)
         self.instructions = []
         self.x = 1
         self._sum_mul_20 = 0
@@ -20,10 +20,9 @@ class Problem(AOCProblem):
         self._ctr_rows = []
 
     def load_data(self, f: Path):
-        with f.open() as buffer:
-            for line in buffer.readlines():
-                parts = line.split()
-                self.instructions.append((self.Instruction(parts[0]),) + tuple(int(x) for x in parts[1:]))
+        for line in self.iter_lines(f):
+            parts = line.split()
+            self.instructions.append((self.Instruction(parts[0]),) + tuple(int(x) for x in parts[1:]))
 
     def solve1(self):
 
@@ -2,7 +2,7 @@ from pathlib import Path
 from queue import SimpleQueue
 from typing import List
 
-from lib import AOCProblem
+from lib import AOCProblem, echo, output, progress
 
 
 class Problem(AOCProblem):
@@ -30,56 +30,48 @@ class Problem(AOCProblem):
 
     MONKEYS: List[Monkey] = []
 
-    def load_data(self, f: Path):
-        n_monkeys = 0
-        last_monkey = None
-
-        with f.open() as buffer:
-            for line in buffer.readlines():
-                if not line.strip():
-                    continue
-
-                fields = line.split(':')
+    def __init__(self, **kwargs):
+        super().__init__(dunder_file_child=__file__, **kwargs)
+        self.MONKEYS = []
 
-                field, value = fields
-
-                if 'Monkey' in fields[0]:
-                    last_monkey = self.Monkey(n_monkeys)
-                    self.MONKEYS.append(last_monkey)
-                    n_monkeys += 1
+    def load_data(self, f: Path):
+        for n_monkey, monkey_lines in enumerate(self.iter_blocks(f)):
+            monkey = self.Monkey(n_monkey)
+            self.MONKEYS.append(monkey)
 
-                    continue
+            for line in monkey_lines[1:]:  # The first one is 'Monkey n:'
+                field, value = line.split(':')
 
                 if 'Starting items' in field:
                     for item in map(int, value.split(',')):
-                        last_monkey.items.put_nowait(item)
+                        monkey.items.put_nowait(item)
                     continue
 
                 if 'Test' in field:
-                    last_monkey.mod = int(value.strip().split(' ')[-1])
+                    monkey.mod = int(value.strip().split(' ')[-1])
                     continue
 
                 if 'Operation' in field:
-                    last_monkey.equation = value.split('=')[1]
+                    monkey.equation = value.split('=')[1]
                     continue
 
                 if 'true' in field:
-                    last_monkey.true_monkey = int(value.strip().split(' ')[-1])
+                    monkey.true_monkey = int(value.strip().split(' ')[-1])
                     continue
                 if 'false' in field:
-                    last_monkey.false_monkey = int(value.strip().split(' ')[-1])
+                    monkey.false_monkey = int(value.strip().split(' ')[-1])
                     continue
 
     def solve1(self):
         return self._solve(div=3, n_rounds=20)
 
     def solve2(self):
-        print('Cannot solve with brute-force methods!')
+        echo('Cannot solve with brute-force methods!')
         return
         self._solve(div=1, n_rounds=10000)
 
     def _solve(self, div, n_rounds):
-        for n_round in range(1, n_rounds + 1):
+        for n_round in progress(range(1, n_rounds + 1), 'Rounds', total=n_rounds):
 
             for monkey in self.MONKEYS:
 
@@ -94,9 +86,10 @@ class Problem(AOCProblem):
 
                     self.MONKEYS[passing_to_m].items.put_nowait(worry_level)
 
-            print(f'At the end of round {n_round}:')
+            if output.enabled:
+                echo(f'At the end of round {n_round}:')
 
-            print('N Inspections', *(f'{m.n}: {m.n_inspections}' for m in self.MONKEYS), sep='\n\t')
+                echo('N Inspections', *(f'{m.n}: {m.n_inspections}' for m in self.MONKEYS), sep='\n\t')
 
         inspections = sorted(m.n_inspections for m in self.MONKEYS)
         return inspections[-1] * inspections[-2]
@@ -1,7 +1,7 @@
+import collections
 from pathlib import Path
-from typing import List, Optional
 
-from lib import AOCProblem, Coordinate2D
+from lib import AOCProblem, Direction2D, Position2D
 
 
 class Problem(AOCProblem):
@@ -10,44 +10,62 @@ class Problem(AOCProblem):
     C_START = 'S'
     C_END = 'E'
 
-    _START_END = [None, None]  # type: List[Optional[Coordinate2D]]
+    # The heights of the start and the end
+    HEIGHTS = {C_START: 'a', C_END: 'z'}
 
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        super().__init__(dunder_file_child=__file__, **kwargs)
         self.riverside = []
+        self.start = self.end = None
+
+        self.steps_to_end = {}
 
     def load_data(self, f: Path):
+        for (y, line) in enumerate(self.iter_lines(f)):
+            if not line.strip():
+                continue
+
+            self.riverside.append(list(line.strip()))
+
+            for c in (self.C_START, self.C_END):
+                if (x := line.find(c)) != -1:
+                    setattr(self, 'start' if c == self.C_START else 'end', Position2D(y, x))
 
-        with f.open() as buffer:
-            for (y, line) in enumerate(buffer.readlines()):
-                self.riverside.append(list(line.strip()))
+    def precompute(self):
+        """Steps to the end from every square, walking backwards from it, as both parts look for the shortest path"""
+        steps_to_end = {self.end: 0}
+        queue = collections.deque([self.end])
 
-                for start_end_pos, c in zip((0, 1), (self.C_START, self.C_END)):
+        while queue:
+            pos = queue.popleft()
+            height = self._height(pos)
 
-                    try:
-                        x = line.index(c)
-                    except ValueError:
-                        continue
+            for direction in Direction2D:
+                next_pos = pos + direction
+                if next_pos in steps_to_end or not self._inside(next_pos):
+                    continue
 
-                    self._START_END[start_end_pos] = Coordinate2D(y, x)
+                # Backwards: the step forwards, from next_pos to pos, climbs at most one
+                if height - self._height(next_pos) > 1:
+                    continue
+
+                steps_to_end[next_pos] = steps_to_end[pos] + 1
+                queue.append(next_pos)
+
+        self.steps_to_end = steps_to_end
 
     def solve1(self):
-        return self._solve()
+        return self.steps_to_end.get(self.start)
 
     def solve2(self):
-        return self._solve()
-
-    def _solve(self):
-        print(*self.riverside, sep='\n')
-        print(self.start, self.end)
+        return min(steps for pos, steps in self.steps_to_end.items() if self._height(pos) == ord('a'))
 
-    @property
-    def start(self):
-        return self._START_END[0]
+    def _inside(self, pos: Position2D) -> bool:
+        return 0 <= pos.y < len(self.riverside) and 0 <= pos.x < len(self.riverside[0])
 
-    @property
-    def end(self):
-        return self._START_END[1]
+    def _height(self, pos: Position2D) -> int:
+        c = self.riverside[pos.y][pos.x]
+        return ord(self.HEIGHTS.get(c, c))
 
 
 if __name__ == '__main__':
@@ -35,8 +35,7 @@ class Problem(lib.AOCProblem):
         self.data = None
 
     def load_data(self, f: pathlib.Path):
-        with f.open() as fd:
-            self.data = fd.read()
+        self.data = list(self.iter_lines(f))
 
     def solve1(self):
         return self._solve(digits_only=True)
@@ -44,15 +43,20 @@ class Problem(lib.AOCProblem):
     def solve2(self):
         return self._solve(digits_only=False)
 
-    def _solve(self, *, digits_only):
-        acc = 0
-        for s in self.data.splitlines():
-            matches = self._match(s, digits_only)
-            n = matches[0] * 10 + matches[-1]
+    def solve_both(self, f: pathlib.Path):
+        acc1 = acc2 = 0
+        for s in self.iter_lines(f):
+            acc1 += self._calibration_value(s, digits_only=True)
+            acc2 += self._calibration_value(s, digits_only=False)
+
+        return acc1, acc2
 
-            acc += n
+    def _solve(self, *, digits_only):
+        return sum(self._calibration_value(s, digits_only) for s in self.data)
 
-        return acc
+    def _calibration_value(self, s, digits_only):
+        matches = self._match(s, digits_only)
+        return matches[0] * 10 + matches[-1]
 
     def _match(self, s, digits_only):
         pos = 0
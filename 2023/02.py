@@ -32,55 +32,64 @@ class Problem(lib.AOCProblem):
         super().__init__(dunder_file_child=__file__, test=test)
         self.games = {}
 
+    MAX_CUBES = Play(12, 13, 14)
+
     def load_data(self, f):
-        with f.open() as f_in:
-            for i, line in enumerate(f_in.readlines()):
-                plays = []
-                for play in line.split(':')[1].split(';'):
-                    play_dict = {}
-                    for c in _COLOURS:
-                        if match := RE[c].search(play):
-                            play_dict[c] = match.groups()[0]
+        for i, line in enumerate(self.iter_lines(f)):
+            self.games[i + 1] = self._parse_game(line)
+
+    @staticmethod
+    def _parse_game(line: str) -> list[Play]:
+        plays = []
+        for play in line.split(':')[1].split(';'):
+            play_dict = {}
+            for c in _COLOURS:
+                if match := RE[c].search(play):
+                    play_dict[c] = match.groups()[0]
 
-                    plays.append(Play(**play_dict))
+            plays.append(Play(**play_dict))
 
-                self.games[i + 1] = plays
+        return plays
 
     def solve1(self):
+        return sum(i for i, game in self.games.items() if self._is_valid(game))
 
-        max_cubes = Play(12, 13, 14)
+    def solve2(self):
+        return sum(self._min_cubes(game).power for game in self.games.values())
 
-        count = 0
+    def solve_both(self, f):
+        count = power_sum = 0
 
-        for i, game in self.games.items():
-            valid_game = True
+        for i, line in enumerate(self.iter_lines(f)):
+            game = self._parse_game(line)
+            if self._is_valid(game):
+                count += i + 1
+            power_sum += self._min_cubes(game).power
 
-            for play in game:
-                if play.red > max_cubes.red or play.green > max_cubes.green or play.blue > max_cubes.blue:
-                    valid_game = False
-                    break
+        return count, power_sum
 
-            if valid_game:
-                count += i
+    def _is_valid(self, game: list[Play]) -> bool:
+        max_cubes = self.MAX_CUBES
 
-        return count
+        for play in game:
+            if play.red > max_cubes.red or play.green > max_cubes.green or play.blue > max_cubes.blue:
+                return False
 
-    def solve2(self):
-        power_sum = 0
-        for i, game in self.games.items():
+        return True
 
-            min_cubes_for_game = Play()
+    @staticmethod
+    def _min_cubes(game: list[Play]) -> Play:
+        min_cubes_for_game = Play()
 
-            for play in game:
-                if play.red > min_cubes_for_game.red:
-                    min_cubes_for_game.red = play.red
-                if play.green > min_cubes_for_game.green:
-                    min_cubes_for_game.green = play.green
-                if play.blue > min_cubes_for_game.blue:
-                    min_cubes_for_game.blue = play.blue
+        for play in game:
+            if play.red > min_cubes_for_game.red:
+                min_cubes_for_game.red = play.red
+            if play.green > min_cubes_for_game.green:
+                min_cubes_for_game.green = play.green
+            if play.blue > min_cubes_for_game.blue:
+                min_cubes_for_game.blue = play.blue
 
-            power_sum += min_cubes_for_game.power
-        return power_sum
+        return min_cubes_for_game
 
 
 if __name__ == '__main__':
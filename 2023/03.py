@@ -46,14 +46,15 @@ class Problem(lib.AOCProblem):
         self.gears = []
 
     def load_data(self, f):
-        with f.open() as f_in:
+        for i, line in enumerate(self.iter_lines(f)):
+            for match in RE_NUMBER.finditer(line):
+                self.numbers.append(Number(int(match.groups()[0]), i, match.start(0), match.end(0)))
 
-            for i, line in enumerate(f_in.readlines()):
-                for match in RE_NUMBER.finditer(line):
-                    self.numbers.append(Number(int(match.groups()[0]), i, match.start(0), match.end(0)))
+            for match in RE_SYMBOL.finditer(line):
+                self.symbols.append(Symbol(match.groups()[0], i, match.start(0)))
 
-                for match in RE_SYMBOL.finditer(line):
-                    self.symbols.append(Symbol(match.groups()[0], i, match.start(0)))
+    def precompute(self):
+        self._connect_numbers_with_symbols()
 
     def _connect_numbers_with_symbols(self):
         for n in self.numbers:
@@ -72,8 +73,6 @@ class Problem(lib.AOCProblem):
             self.gears.append(Gear(*numbers))
 
     def solve1(self):
-        self._connect_numbers_with_symbols()
-
         return sum(n.n for n in self.numbers if n.part)
 
     def solve2(self):
@@ -22,23 +22,23 @@ class Problem(lib.AOCProblem):
         self.cards = {}
 
     def load_data(self, f):
-        with f.open() as f_in:
-            for i, line in enumerate(f_in):
-                info = line.strip().split(':')[1].strip()
-                winning_str, mine_str = info.split('|')
+        for i, line in enumerate(self.iter_lines(f)):
+            info = line.strip().split(':')[1].strip()
+            winning_str, mine_str = info.split('|')
 
-                winning = set(int(x) for x in winning_str.strip().split(' ') if x)
-                mine = set(int(x) for x in mine_str.strip().split(' ') if x)
+            winning = set(int(x) for x in winning_str.strip().split(' ') if x)
+            mine = set(int(x) for x in mine_str.strip().split(' ') if x)
 
-                self.cards[i] = ScratchCard(i, winning, mine)
+            self.cards[i] = ScratchCard(i, winning, mine)
+
+    def precompute(self):
+        self._fill_union()
 
     def _fill_union(self):
         for card in self.cards.values():
             card.union = card.winning & card.mine
 
     def solve1(self):
-        self._fill_union()
-
         points = 0
 
         for card in self.cards.values():
@@ -191,33 +191,23 @@ class Problem(lib.AOCProblem):
         self.thin_range_map = None
 
     def load_data(self, f):
-        with f.open() as f_in:
-            self.seeds = [int(n) for n in f_in.readline().strip().split(':')[1].split(' ') if n]
+        blocks = self.iter_blocks(f)
 
-            range_map = None
+        seeds_line, = next(blocks)
+        self.seeds = [int(n) for n in seeds_line.strip().split(':')[1].split(' ') if n]
 
-            for line in f_in:
+        for map_header, *range_lines in blocks:
+            if 'map' not in map_header:
+                raise RuntimeError(f'No map defined: {map_header}')
 
-                if 'map' in line:
-                    map_name = line.split(' ')[0].strip()
-                    src, _, dst = [s for s in map_name.split('-')]
-                    range_map = RangeMap(src, dst)
-                    continue
-
-                if not line.strip():
-                    if range_map:
-                        self.range_maps[range_map.src] = range_map
-                        range_map = None
-
-                    continue
-
-                if not range_map:
-                    raise RuntimeError('No map defined')
+            map_name = map_header.split(' ')[0].strip()
+            src, _, dst = [s for s in map_name.split('-')]
+            range_map = RangeMap(src, dst)
 
-                range_map.add(RangeConversion(*[int(n) for n in line.strip().split(' ')]))
+            # All at once, as every add sorts and checks the ranges
+            range_map.add_all([RangeConversion(*[int(n) for n in line.strip().split(' ')]) for line in range_lines])
 
-            if range_map:
-                self.range_maps[range_map.src] = range_map
+            self.range_maps[range_map.src] = range_map
 
     def solve1(self):
 
@@ -239,9 +229,10 @@ class Problem(lib.AOCProblem):
 
         return min(locations) if locations else None
 
-    def solve2(self):
+    def precompute(self):
         self._thin_map()
 
+    def solve2(self):
         seed_intervals = self._get_seed_ranges()
 
         edge_locations = []
@@ -278,10 +269,6 @@ class Problem(lib.AOCProblem):
 
     def _thin_map(self):
         """If the map is thin, we can quickly convert the seeds to the locations"""
-        if self.thin_range_map:
-            return
-
-
         type_src = 'seed'
 
         combined_map = self.range_maps[type_src]
@@ -13,21 +13,20 @@ class Problem(lib.AOCProblem):
         self.distances = []
 
     def load_data(self, f):
-        with f.open() as f_in:
-            for line in f_in:
-                line = line.strip()
-                if not line:
-                    continue
+        for line in self.iter_lines(f):
+            line = line.strip()
+            if not line:
+                continue
 
-                if 'Time:' in line:
-                    self.times.extend([int(n) for n in line.split(':')[1].split(' ') if n])
+            if 'Time:' in line:
+                self.times.extend([int(n) for n in line.split(':')[1].split(' ') if n])
 
-                elif 'Distance:' in line:
-                    self.distances.extend([int(n) for n in line.split(':')[1].split(' ') if n])
+            elif 'Distance:' in line:
+                self.distances.extend([int(n) for n in line.split(':')[1].split(' ') if n])
 
     def solve1(self):
-        print(self.times)
-        print(self.distances)
+        lib.echo(self.times)
+        lib.echo(self.distances)
 
         results = 1
 
@@ -47,9 +46,10 @@ class Problem(lib.AOCProblem):
         return self._solve_race(round_no, distance_thr, time_avail)
 
     def _solve_race(self, round_no, distance_thr, time_avail):
-        print(f'Round {round_no + 1}: {time_avail = } ms, {distance_thr = } mm')
+        if lib.output.enabled:
+            lib.echo(f'Round {round_no + 1}: {time_avail = } ms, {distance_thr = } mm')
         n_working = 0
-        for time_pressed in range(1, time_avail):
+        for time_pressed in lib.progress(range(1, time_avail), f'Round {round_no + 1}', total=time_avail - 1):
             speed = time_pressed * self.ACC
             time_travelling = time_avail - time_pressed
             distance_travelled = time_travelling * speed
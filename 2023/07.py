@@ -123,23 +123,48 @@ class PokerHand:
 class Problem(lib.AOCProblem):
     """2023-12-07 puzzle https://adventofcode.com/2023/day/7"""
 
+    # Hands classified once for all the inputs of a batch, by their cards, and with their Js as jokers by their cards.
+    # Only those of the last batch are kept. See prepare_batch
+    _hands: dict[str, PokerHand] = {}
+    _joker_hands: dict[tuple, PokerHand] = {}
+
     def __init__(self, test=False):
         super().__init__(dunder_file_child=__file__, test=test)
 
         self.games = []
 
+    @classmethod
+    def prepare_batch(cls, input_fs):
+        """Classifies the hands of every input in one pass, each distinct hand once. Those of a previous batch are
+        dropped, not to grow with every batch in processes solving many, like server.py"""
+        cls._hands = {}
+        cls._joker_hands = {}
+
+        hands = set()
+        for f in input_fs:
+            try:
+                hands.update(line.split()[0] for line in lib.iter_lines(lib.resolve_input(f)) if line.strip())
+            except OSError:
+                continue  # Reported when its turn to be solved comes
+
+        for hand in hands:
+            cls._hands[hand] = poker_hand = PokerHand(hand)
+            if PokerCard.J in poker_hand.hand:
+                cls._joker_hands[poker_hand.hand] = cls._replace_j_with_joker(poker_hand)
+
     def load_data(self, f):
-        with f.open() as f_in:
-            for line in f_in:
-                hand, bid = line.split()
-                self.games.append((PokerHand(hand), int(bid)))
+        for line in self.iter_lines(f):
+            hand, bid = line.split()
+            self.games.append((self._hands.get(hand) or PokerHand(hand), int(bid)))
 
-            self._sort_games()
+        self._sort_games()
 
     def solve1(self):
         score = 0
+        echoing = lib.output.enabled  # Not to build the lines of every game when they go nowhere
         for rank, (hand, bid) in enumerate(self.games, start=1):
-            print(f'{rank:4d} | {hand} | {bid:4d} | {bid * rank:6d}')
+            if echoing:
+                lib.echo(f'{rank:4d} | {hand} | {bid:4d} | {bid * rank:6d}')
 
             score += bid * rank
 
@@ -149,8 +174,10 @@ class Problem(lib.AOCProblem):
         self._replace_j_with_jokers()
 
         score = 0
+        echoing = lib.output.enabled  # Not to build the lines of every game when they go nowhere
         for rank, (hand, bid) in enumerate(self.games, start=1):
-            print(f'{rank:4d} | {hand} | {bid:4d} | {bid * rank:6d}')
+            if echoing:
+                lib.echo(f'{rank:4d} | {hand} | {bid:4d} | {bid * rank:6d}')
 
             score += bid * rank
 
@@ -159,7 +186,7 @@ class Problem(lib.AOCProblem):
     def _replace_j_with_jokers(self):
         for i, (hand, bid) in enumerate(self.games):
             if PokerCard.J in hand.hand:
-                self.games[i] = (self._replace_j_with_joker(hand), bid)
+                self.games[i] = (self._joker_hands.get(hand.hand) or self._replace_j_with_joker(hand), bid)
         self._sort_games()
 
     def _sort_games(self):
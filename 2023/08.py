@@ -45,22 +45,23 @@ class Problem(lib.AOCProblem):
         self.nodes = {}
 
     def load_data(self, f):
-        with f.open() as f_in:
+        lines = self.iter_lines(f)
 
-            self.instructions = f_in.readline().strip()
+        self.instructions = next(lines).strip()
 
-            for line in f_in:
-                if not (line := line.strip()):
-                    continue
+        for line in lines:
+            if not (line := line.strip()):
+                continue
 
-                if not (match := RE_NODE.match(line)):
-                    raise ValueError(f'Invalid node: {line}')
+            if not (match := RE_NODE.match(line)):
+                raise ValueError(f'Invalid node: {line}')
 
-                parent_name, left, right = match.groups()
-                self.nodes[parent_name] = Node(parent_name, None, left, right)
+            parent_name, left, right = match.groups()
+            self.nodes[parent_name] = Node(parent_name, None, left, right)
 
-    def post_load(self):
-        self.logger.debug('Instructions: "%s"', self.instructions)
+    def precompute(self):
+        if trace := self.trace:
+            trace('Instructions: "%s"', self.instructions)
         self._join_nodes()
 
     def _join_nodes(self):
@@ -85,10 +86,13 @@ class Problem(lib.AOCProblem):
                 return i
 
     def solve2(self):
+        trace = self.trace
+
         iter_nodes = {idx: node for idx, node in enumerate(self.nodes.values()) if node.is_ghost_start}
 
-        for idx, node in iter_nodes.items():
-            self.logger.debug('Node %s: %s', idx, node)
+        if trace:
+            for idx, node in iter_nodes.items():
+                trace('Node %s: %s', idx, node)
         offsets = {}
         periods = {}
 
@@ -103,15 +107,17 @@ class Problem(lib.AOCProblem):
                         offsets[idx] = i
                         offset_to_be_found = False
 
-                        self.logger.debug('Offsets: %s', offsets)
+                        if trace:
+                            trace('Offsets: %s', offsets)
 
                         continue
 
                     periods[idx] = i - offsets[idx]
                     break
 
-        self.logger.debug('Offsets: %s', offsets)
-        self.logger.debug('Periods: %s', periods)
+        if trace:
+            trace('Offsets: %s', offsets)
+            trace('Periods: %s', periods)
 
         return math.lcm(*[int(x) for x in periods.values()])
 
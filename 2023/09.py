@@ -11,12 +11,11 @@ class Problem(lib.AOCProblem):
         self.histories = []
 
     def load_data(self, f):
-        with f.open() as f_in:
-            for line in f_in:
-                self.histories.append(tuple(map(int, line.split(' '))))
+        for line in self.iter_lines(f):
+            self.histories.append(tuple(map(int, line.split(' '))))
 
     def solve1(self):
-        print(self.histories)
+        lib.echo(self.histories)
 
         return sum(self._forecast(history) for history in self.histories)
 
@@ -65,10 +64,13 @@ class Problem(lib.AOCProblem):
         return hist_matrix
 
     def _print_hist_matrix(self, hist_matrix):
-        self.logger.debug(f'hist_matrix:')
+        if not (trace := self.trace):
+            return
+
+        trace('hist_matrix:')
         for n, hist in enumerate(hist_matrix):
             str_hist = ' | '.join(map(lambda x: f'{x:3}', hist))
-            self.logger.debug(f'{" " * 2 * n}{str_hist}')
+            trace('%s%s', ' ' * 2 * n, str_hist)
 
 
 if __name__ == '__main__':
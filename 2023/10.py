@@ -2,11 +2,8 @@ import enum
 from typing import Optional
 
 import lib
-import logging
 import queue
 
-import colorama
-
 
 @enum.unique
 class Pixel(enum.StrEnum):
@@ -20,25 +17,28 @@ class Pixel(enum.StrEnum):
     GROUND = '.'
     START = 'S'
 
-    def connects_with(self, other: 'Pixel', direction: Optional[lib.Coordinate2D] = None):
+    def connects_with(self, other: 'Pixel', direction: Optional[lib.Coordinate2D] = None, trace=None):
+        """trace as given by lib.tracer"""
+        connects = self._connects_with(other, direction)
+
+        if trace:
+            trace('Connects %s with %s in %s? %s', self, other, direction, 'TRUE' if connects else 'NO')
 
+        return connects
+
+    def _connects_with(self, other: 'Pixel', direction: Optional[lib.Coordinate2D]):
         if not self.may_connect_with(other):
-            logging.debug(f'Connects {self} with {other} in {direction}? NO')
             return False
         if not direction:
-            logging.debug(f'Connects {self} with {other} in {direction}? TRUE')
             return True
 
         direction_other = - direction
 
         if self != self.START and direction.name not in self.name[:3]:
-            logging.debug(f'Connects {self} with {other} in {direction}? NO')
             return False
         if other != self.START and direction_other.name not in other.name[:3]:
-            logging.debug(f'Connects {self} with {other} in {direction}? NO')
             return False
 
-        logging.debug(f'Connects {self} with {other} in {direction}? TRUE')
         return True
 
     def may_connect_with(self, other):
@@ -154,28 +154,33 @@ class Problem(lib.AOCProblem):
 
     def load_data(self, f):
         diagram = []
-        with f.open() as f_in:
-            for line in f_in:
-                diagram.append([Pixel(s) for s in line.strip()])
+        for line in self.iter_lines(f):
+            diagram.append([Pixel(s) for s in line.strip()])
 
         self.diagram = Diagram(diagram)
 
-    def solve1(self):
-        logging.debug('Diagram:\n%s', self.diagram)
-        logging.debug('Diagram:\n%s', self.diagram.unicode())
+    def precompute(self):
+        if trace := self.trace:
+            trace('Diagram:\n%s', self.diagram)
+            trace('Diagram:\n%s', self.diagram.unicode())
         self._find_s_loop()
 
+    def solve1(self):
+        trace = self.trace
         max_d = 0
 
         for node, distance in self.distances.items():
-            logging.debug(f'{node}: {distance}')
+            if trace:
+                trace('%s: %s', node, distance)
             if distance > max_d:
                 max_d = distance
 
-        logging.debug('Diagram:\n%s', self.diagram.unicode())
+        if trace:
+            trace('Diagram:\n%s', self.diagram.unicode())
         return max_d
 
     def solve2(self):
+        trace = self.trace
         surrounded_nodes = set()
 
         diagram_contour = sorted(set(
@@ -184,7 +189,8 @@ class Problem(lib.AOCProblem):
         ))
 
         for element in diagram_contour:
-            self.logger.debug('Element: %s', element, )
+            if trace:
+                trace('Element: %s', element)
 
             exit_found = False
 
@@ -198,7 +204,8 @@ class Problem(lib.AOCProblem):
                 next_pos = element.pos + coordinate
                 while True:
                     try:
-                        self.logger.debug('Element: %s. Next pos: %s', element, next_pos)
+                        if trace:
+                            trace('Element: %s. Next pos: %s', element, next_pos)
                         if self.diagram[next_pos] != Pixel.GROUND:
                             break
 
@@ -212,7 +219,7 @@ class Problem(lib.AOCProblem):
             if not exit_found:
                 surrounded_nodes.add(element.pos)
 
-        print()
+        lib.echo()
         self._print_colours(surrounded_nodes)
 
         return len(surrounded_nodes)
@@ -221,9 +228,12 @@ class Problem(lib.AOCProblem):
         if self._s_loop_start:
             return self._s_loop_start
 
+        trace = self.trace
+
         start_node = Node(self.diagram.start)
         self._start = start_node
-        logging.debug(f'Start: {start_node}')
+        if trace:
+            trace('Start: %s', start_node)
         self.pipe.append(self.diagram.start.pos)
 
         node_queue = queue.Queue()
@@ -231,11 +241,16 @@ class Problem(lib.AOCProblem):
         node_queue.put((start_node, 0))
         visited_node_pos_distance = {start_node.element.pos: 0}
         board_size = self.diagram.size
+        count = lib.metrics.count
+        gauge = lib.metrics.gauge
 
         while not node_queue.empty():
-            logging.debug(f'Queue: {node_queue.queue}')
+            if trace:
+                trace('Queue: %s', node_queue.queue)
 
+            gauge('queue depth', node_queue.qsize())
             node, distance = node_queue.get()
+            count('states popped')
             next_distance = distance + 1
 
             for direction, next_node_pos in node.element.pos.iter_direction_neighbours(filter_out_of_bounds=board_size,
@@ -243,18 +258,19 @@ class Problem(lib.AOCProblem):
 
                 if (next_element := self.diagram[next_node_pos]).pixel == Pixel.GROUND:
                     continue
-                if not node.element.pixel.connects_with(next_element.pixel, direction):
+                if not node.element.pixel.connects_with(next_element.pixel, direction, trace):
                     continue
 
                 next_node = Node(next_element, _meta={'distance': next_distance})
 
                 if next_node_pos in visited_node_pos_distance:
                     if visited_node_pos_distance[next_node_pos] <= distance:
-                        logging.debug(f'Already visited {next_node_pos}')
+                        if trace:
+                            trace('Already visited %s', next_node_pos)
 
                         continue
-                    else:
-                        logging.debug(f'Shortcut found to {next_node_pos}')
+                    elif trace:
+                        trace('Shortcut found to %s', next_node_pos)
 
                 node.next = next_node
                 next_node.prev = node
@@ -267,19 +283,11 @@ class Problem(lib.AOCProblem):
         self.distances = visited_node_pos_distance
 
     def _print_colours(self, inside_nodes=None):
-        inside_nodes = inside_nodes or set()
-        colorama.init()
-        for y, bw_line in enumerate(self.diagram.unicode().splitlines()):
-            colour_line = []
-            for x, char in enumerate(bw_line):
-                if (y, x) in self.pipe:
-                    colour_line.append(colorama.Fore.GREEN + char + colorama.Style.RESET_ALL)
-                elif (y, x) in inside_nodes:
-                    colour_line.append(colorama.Fore.RED + char + colorama.Style.RESET_ALL)
-                else:
-                    colour_line.append(char)
-
-            print(*colour_line, sep='')
+        if not lib.output.enabled:
+            return
+
+        overlays = {'green': set(self.pipe), 'red': set(inside_nodes or ())}
+        lib.echo(lib.GridRenderer(overlays).frame(self.diagram.unicode().splitlines()))
 
 
 if __name__ == '__main__':
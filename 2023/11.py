@@ -11,6 +11,9 @@ class Problem(lib.AOCProblem):
         VACUUM = '.'
         GALAXY = '#'
 
+    # Pairs of galaxies grow with the square of the input, each with the rows and columns between them, the square root
+    EXPECTED_EXPONENTS = {'solve1': 2.5, 'solve2': 2.5}
+
     def __init__(self, test=False, verbose=False):
         super().__init__(dunder_file_child=__file__, test=test, verbose=verbose)
 
@@ -22,17 +25,16 @@ class Problem(lib.AOCProblem):
     def load_data(self, f):
 
         occupied_cols = set()
-        with f.open() as f_in:
-            for y, line in enumerate(f_in):
+        for y, line in enumerate(self.iter_lines(f)):
 
-                if self.SpaceItems.GALAXY not in line:
-                    self.empty_rows.append(y)
-                    continue
+            if self.SpaceItems.GALAXY not in line:
+                self.empty_rows.append(y)
+                continue
 
-                for x, c in enumerate(line):
-                    if c == self.SpaceItems.GALAXY:
-                        self.galaxies.add(lib.Position2D(y, x))
-                        occupied_cols.add(x)
+            for x, c in enumerate(line):
+                if c == self.SpaceItems.GALAXY:
+                    self.galaxies.add(lib.Position2D(y, x))
+                    occupied_cols.add(x)
 
         self.empty_cols = [c for c in range(max(occupied_cols)) if c not in occupied_cols]
 
@@ -43,6 +45,8 @@ class Problem(lib.AOCProblem):
         return self._solve(factor=1_000_000)
 
     def _solve(self, factor=1):
+        trace = self.trace
+
         shortest_paths_sum = 0
         for g1, g2 in itertools.combinations(sorted(self.galaxies), 2):
             d = g1.manhattan_distance(g2)
@@ -50,7 +54,8 @@ class Problem(lib.AOCProblem):
             expansion_effect = self._expansion_between(g1, g2, factor)
             self.expansions.append((g1, g2, factor, expansion_effect))
             shortest_paths_sum += d + expansion_effect
-            self.logger.debug('Distance %s <-> %s = %d. (exp=%d)', g1, g2, d, expansion_effect)
+            if trace:
+                trace('Distance %s <-> %s = %d. (exp=%d)', g1, g2, d, expansion_effect)
 
         return shortest_paths_sum
 
@@ -26,13 +26,11 @@ class Problem(lib.AOCProblem):
         groups: list
         n_options: int = 0
 
-        def __post_init__(self):
-            self.n_options = self._get_n_options()
-
         def _get_n_options(self):
             n_options = 0
 
             record_queue = queue.LifoQueue()
+            count = lib.metrics.count
 
             record_queue.put(self.record)
 
@@ -51,7 +49,9 @@ class Problem(lib.AOCProblem):
 
                     if filtered_option := self._filter_option(new_record, partial_ok=True):
                         record_queue.put(filtered_option)
+                        count('records pushed')
 
+            lib.metrics.observe('options per row', n_options)
             return n_options
 
         def _filter_option(self, option, partial_ok=False) -> str | None:
@@ -92,14 +92,19 @@ class Problem(lib.AOCProblem):
         self.spring_rows = []
 
     def load_data(self, f):
-        with f.open() as f_in:
-            for line in f_in:
-                record, groups = line.strip().split(' ')
-                self.spring_rows.append(self.SpringRow(record, [int(x) for x in groups.split(',')]))
+        for line in self.iter_lines(f):
+            record, groups = line.strip().split(' ')
+            self.spring_rows.append(self.SpringRow(record, [int(x) for x in groups.split(',')]))
+
+    def precompute(self):
+        """The rows are independent, hence counted in parallel"""
+        for row, n_options in zip(self.spring_rows, lib.parallel_map(self.SpringRow._get_n_options, self.spring_rows)):
+            row.n_options = n_options
 
     def solve1(self):
-        for row in self.spring_rows:
-            self.logger.debug('Record %20s, Gr %s, N_Opts: %d', row.record, row.groups, row.n_options)
+        if trace := self.trace:
+            for row in self.spring_rows:
+                trace('Record %20s, Gr %s, N_Opts: %d', row.record, row.groups, row.n_options)
         return sum(row.n_options for row in self.spring_rows)
 
     def solve2(self):
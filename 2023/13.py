@@ -24,19 +24,8 @@ class Problem(lib.AOCProblem):
         self.repeated = set()
 
     def load_data(self, f):
-        with open(f) as f_in:
-            rows = f_in.readlines()
-
-        last_read = 0
-        for i in range(len(rows)):
-
-            if rows[i].strip():
-                continue
-
-            self.grids.append(lib.AOCGrid(rows=rows[last_read:i], types=self.Symbols))
-            last_read = i + 1
-
-        self.grids.append(lib.AOCGrid(rows=rows[last_read:], types=self.Symbols))
+        for rows in self.iter_blocks(f):
+            self.grids.append(lib.AOCGrid(rows=rows, types=self.Symbols))
 
     def solve1(self):
         acc = 0
@@ -48,48 +37,48 @@ class Problem(lib.AOCProblem):
         return acc
 
     def solve2(self):
-        acc = 0
+        """The grids are independent, hence searched for their smudges in parallel"""
+        return sum(lib.parallel_map(self._smudged_reflection, self.grids))
 
-        for grid_n, grid in enumerate(self.grids):
-            part_1_col = self._mirror_cols(grid)
-            part_1_row = self._mirror_rows(grid)
+    def _smudged_reflection(self, grid) -> int:
+        part_1_col = self._mirror_cols(grid)
+        part_1_row = self._mirror_rows(grid)
 
-            acc_xy = 0
+        acc_xy = 0
 
-            it = 0
-            for y in range(grid.height):
-                reflexion_found = False
-                for x in range(grid.width):
-                    new_grid = grid.copy()
-                    new_grid[y, x] = self.Symbols.ROCKS if grid[y, x] == self.Symbols.ASH else self.Symbols.ASH
+        it = 0
+        for y in range(grid.height):
+            reflexion_found = False
+            for x in range(grid.width):
+                new_grid = grid.copy()
+                new_grid[y, x] = self.Symbols.ROCKS if grid[y, x] == self.Symbols.ASH else self.Symbols.ASH
 
-                    new_row_val = set(self._mirror_rows(new_grid))
-                    new_row_val = list(new_row_val - set(part_1_row))
-                    new_col_val = []
+                new_row_val = set(self._mirror_rows(new_grid))
+                new_row_val = list(new_row_val - set(part_1_row))
+                new_col_val = []
 
-                    if not new_row_val:
-                        new_col_val = set(self._mirror_cols(new_grid))
-                        new_col_val = list(new_col_val - set(part_1_col))
+                if not new_row_val:
+                    new_col_val = set(self._mirror_cols(new_grid))
+                    new_col_val = list(new_col_val - set(part_1_col))
 
-                        if not new_col_val:
-                            it += 1
-                            continue
+                    if not new_col_val:
+                        it += 1
+                        continue
 
-                    new_row_val = new_row_val or [0]
-                    new_col_val = new_col_val or [0]
-                    acc_xy = 100 * new_row_val[0] + new_col_val[0]
+                new_row_val = new_row_val or [0]
+                new_col_val = new_col_val or [0]
+                acc_xy = 100 * new_row_val[0] + new_col_val[0]
 
-                    reflexion_found = True
-                    break
+                reflexion_found = True
+                break
 
-                if reflexion_found:
-                    break
+            if reflexion_found:
+                break
 
-            if not acc_xy:
-                raise RuntimeError('No reflexion found')
-            acc += acc_xy
+        if not acc_xy:
+            raise RuntimeError('No reflexion found')
 
-        return acc
+        return acc_xy
 
     def _mirror_cols(self, grid, ) -> list[int]:
         return self._find_mirror_edge(grid.cols, grid.width, )
@@ -149,15 +138,21 @@ class Problem(lib.AOCProblem):
         return mirror_positions
 
     def _print_info(self, i, grid, new_grid, *args):
-        print(
-            f'Trying {i:2d}|', ''.join(self._c(x) for x in grid[0]), '|', ''.join(self._c(x) for x in new_grid[0]),
-            '|', *args)
-        for i in range(1, grid.height):
-            print(
-                '         |', ''.join(self._c(x) for x in grid[i]), '|', ''.join(self._c(x) for x in new_grid[i]),
-                '|')
-
-        print()
+        if not lib.output.enabled:
+            return
+
+        smudged = {(y, x) for y in range(grid.height) for x in range(grid.width) if grid[y, x] != new_grid[y, x]}
+
+        renderer = lib.GridRenderer()
+        rows = renderer.frame([map(self._c, grid[y]) for y in range(grid.height)]).splitlines()
+        new_rows = renderer.frame([map(self._c, new_grid[y]) for y in range(grid.height)],
+                                  {'red': smudged}).splitlines()
+
+        lines = [f'{f"Trying {i:2d}" if y == 0 else "":9}| {row} | {new_row} |'
+                 for y, (row, new_row) in enumerate(zip(rows, new_rows))]
+        lines[0] = ' '.join((lines[0], *map(str, args)))
+
+        lib.echo('\n'.join(lines), end='\n\n')
 
     def _c(self, s):
         return self._PRINT_MAP[s]
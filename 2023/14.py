@@ -28,6 +28,8 @@ class Problem(lib.AOCProblem):
         return self._weight()
 
     def solve2(self, n=1_000_000_000):
+        trace = self.trace
+
         self._load_rocks()  # We are actually resetting them
 
         grids = {}
@@ -35,28 +37,39 @@ class Problem(lib.AOCProblem):
 
         cycle_0 = cycle_f = None
 
-        for i in range(n):
+        renderer = lib.GridRenderer() if lib.output.animating else None
+
+        for i in lib.progress(range(n), 'Searching for a cycle of spin cycles'):
 
             if (se := self.hash()) in grids:
                 cycle_0 = grids[se]
                 cycle_f = i
-                self.logger.debug(f'Cycle detected @ {i} SE: {se}')
-                self.logger.debug(f'Cycle length {cycle_f - cycle_0}, cycle offset {cycle_0}')
+                lib.metrics.gauge('cycle length', cycle_f - cycle_0)
+                lib.metrics.gauge('cycle offset', cycle_0)
+                if trace:
+                    trace('Cycle detected @ %d SE: %s', i, se)
+                    trace('Cycle length %d, cycle offset %d', cycle_f - cycle_0, cycle_0)
 
                 break
 
             grids[se] = i
             weights[i] = self._weight()
 
-            self.logger.debug(f'Cycle {i} weight {weights[i]:3}. SE: {se}')
+            if trace:
+                trace('Cycle %d weight %3d. SE: %s', i, weights[i], se)
 
             self._cycle()
+            lib.metrics.count('spin cycles')
+
+            if renderer:
+                self.print(renderer)
 
         if cycle_0 is None:
             return weights[n - 1]
 
         equivalent_n = cycle_0 + (n - cycle_f) % (cycle_f - cycle_0)
-        self.logger.debug(f'Equivalent n: {equivalent_n}')
+        if trace:
+            trace('Equivalent n: %d', equivalent_n)
         return weights[equivalent_n]
 
     def _cycle(self):
@@ -120,26 +133,27 @@ class Problem(lib.AOCProblem):
 
         return weight
 
-    def print(self):
-        print(str(self).replace('|', '\n'), end='\n\n')
-
-    def __str__(self):
-        rows = []
+    def print(self, renderer: lib.GridRenderer = None):
+        """Given a renderer, as when animating the spin cycles, only what changed since its previous frame is redrawn"""
+        if not lib.output.enabled:
+            return
 
-        for y in range(self.grid.height):
+        if renderer:
+            lib.echo(renderer.redraw(self._rows()), end='')
+        else:
+            lib.echo('\n'.join(self._rows()), end='\n\n')
 
-            row = []
-            for x in range(self.grid.width):
-                if (y, x) in self.rounded_rocks:
-                    row.append(self.Symbols.ROUNDED_ROCK)
-                elif (y, x) in self.cube_shaped_rocks:
-                    row.append(self.Symbols.CUBE_SHAPED_ROCK)
-                else:
-                    row.append(self.Symbols.EMPTY)
+    def _rows(self) -> list[str]:
+        rows = [[self.Symbols.EMPTY] * self.grid.width for _ in range(self.grid.height)]
+        for symbol, positions in ((self.Symbols.CUBE_SHAPED_ROCK, self.cube_shaped_rocks),
+                                  (self.Symbols.ROUNDED_ROCK, self.rounded_rocks)):
+            for pos in positions:
+                rows[pos.y][pos.x] = symbol
 
-            rows.append(''.join(row))
+        return [''.join(row) for row in rows]
 
-        return '|'.join(rows)
+    def __str__(self):
+        return '|'.join(self._rows())
 
     def hash(self):
         return '|'.join(f'RR({p.y},{p.x})' for p in self.rounded_rocks)
@@ -18,8 +18,7 @@ class Problem(lib.AOCProblem):
         self.boxes: dict[int, list[Problem.Lens]] = {n: [] for n in range(256)}
 
     def load_data(self, f):
-        with f.open() as f_in:
-            self.check_values = f_in.readline().split(',')
+        self.check_values = next(self.iter_lines(f)).split(',')
 
     def solve1(self):
         t = 0
@@ -30,10 +29,14 @@ class Problem(lib.AOCProblem):
         return t
 
     def solve2(self):
+        trace = self.trace
+
         for item in self.check_values:
-            self.logger.debug(f'Processing {item}')
+            if trace:
+                trace('Processing %s', item)
             self._process(item)
-            self.print()
+            if trace:
+                self.print()
 
         return self.focusing_power()
 
@@ -59,7 +62,8 @@ class Problem(lib.AOCProblem):
 
         if lens_idx is not None:
             self.boxes[box][lens_idx].focal_length = focal_length
-            self.logger.debug(f'Updated {lens}')
+            if trace := self.trace:
+                trace('Updated %s', lens)
             return
 
         self.boxes[box].append(self.Lens(item_name, focal_length))
@@ -71,7 +75,8 @@ class Problem(lib.AOCProblem):
         try:
             self.boxes[box].remove(self.Lens(item_name))
         except ValueError:
-            self.logger.debug(f'Nothing to remove for {item}')
+            if trace := self.trace:
+                trace('Nothing to remove for %s', item)
 
     @staticmethod
     def _hash(string):
@@ -97,7 +102,7 @@ class Problem(lib.AOCProblem):
         for n_box, box in self.boxes.items():
             if not box:
                 continue
-            self.logger.debug(f'Box {n_box}: {box}')
+            self.logger.debug('Box %d: %s', n_box, box)
 
     def test_it(self):
         assert self.focusing_power({0: [self.Lens('rn', 1)]}) == 1
@@ -27,20 +27,29 @@ class Problem(lib.AOCProblem):
         return self._get_energized_positions(init_pos=lib.Position2D(0, 0), init_d=lib.Direction2D.R)
 
     def _get_energized_positions(self, init_pos, init_d):
+        trace = self.trace
+
         process_queue = queue.Queue()
         process_queue.put((init_pos, init_d))
 
         energized_positions = set()
         history = set()
+        count = lib.metrics.count
+        gauge = lib.metrics.gauge
 
         while not process_queue.empty():
+            gauge('queue depth', process_queue.qsize())
             pos, direction = process_queue.get()
+            count('states popped')
             if (pos, direction) in history:
-                self.logger.debug(f'Already processed {pos} {direction}')
+                count('states already processed')
+                if trace:
+                    trace('Already processed %s %s', pos, direction)
                 continue
             history.add((pos, direction))
 
-            self.logger.debug(f'Processing {pos} {direction}')
+            if trace:
+                trace('Processing %s %s', pos, direction)
             if self.grid.pos_is_oob(pos):
                 continue
 
@@ -64,30 +73,33 @@ class Problem(lib.AOCProblem):
                 new_pos = pos + d
                 if self.grid.pos_is_oob(new_pos):
                     continue
-                self.logger.debug(f'Processing {pos} ({symbol}) to new direction {d}')
+                if trace:
+                    trace('Processing %s (%s) to new direction %s', pos, symbol, d)
                 process_queue.put((new_pos, d))
 
+        gauge('history size', len(history))
         return len(energized_positions)
 
     def solve2(self):
-        max_energy = 0
-        for y in range(self.grid.height):
-            energy_0 = self._get_energized_positions(init_pos=lib.Position2D(y, x=0), init_d=lib.Direction2D.R)
+        """The beams entering from every edge are independent, hence followed in parallel"""
+        xf = self.grid.width - 1
+        yf = self.grid.height - 1
 
-            xf = self.grid.width - 1
-            energy_f = self._get_energized_positions(init_pos=lib.Position2D(y, x=xf), init_d=lib.Direction2D.L)
-            max_energy = max(max_energy, energy_0, energy_f)
+        entries = []
+        for y in range(self.grid.height):
+            entries.append((lib.Position2D(y, x=0), lib.Direction2D.R))
+            entries.append((lib.Position2D(y, x=xf), lib.Direction2D.L))
 
         for x in range(self.grid.width):
-            energy_0 = self._get_energized_positions(init_pos=lib.Position2D(y=0, x=x), init_d=lib.Direction2D.D)
-
-            yf = self.grid.height - 1
-            energy_f = self._get_energized_positions(init_pos=lib.Position2D(y=yf, x=x), init_d=lib.Direction2D.U)
-            max_energy = max(max_energy, energy_0, energy_f)
+            entries.append((lib.Position2D(y=0, x=x), lib.Direction2D.D))
+            entries.append((lib.Position2D(y=yf, x=x), lib.Direction2D.U))
 
+        return max(lib.parallel_map(self._get_energized_positions_from, entries))
 
+    def _get_energized_positions_from(self, entry):
+        init_pos, init_d = entry
+        return self._get_energized_positions(init_pos=init_pos, init_d=init_d)
 
-        return max_energy
     def _swap_direction(self, direction, directions):
         directions_a = set(directions)
         directions_b = set(lib.Direction2D) - directions_a
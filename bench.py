@@ -0,0 +1,453 @@
+""" Statistical benchmark of the stages of a day, and comparison of two benchmark results.
+
+    python bench.py 2023/05 -n 20 -w 3 -o before.json
+    python bench.py --compare before.json after.json
+    python bench.py 2023/05 --startup   # Import time per module of a fresh interpreter loading the day
+    python bench.py 2023/11 --complexity -x 0.25 0.5 1 2 4   # How the stages grow with the size of the input
+    python bench.py 2023/16 --scaling --workers 1 2 4   # How the lib.parallel_map backends scale with the workers
+"""
+
+import argparse
+import collections
+import functools
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from pathlib import Path
+
+import lib
+import runner
+
+
+def benchmark(problem_cls: type[lib.AOCProblem], repeat=10, warmup=2, test=False, use_cache=False,
+              fused=True, input_f=None, probes=()) -> dict:
+    """Runs every stage on a fresh instance per repetition. Warmup repetitions are discarded. Days with solve_both
+    are benchmarked with it, unless fused is False. input_f, e.g. a generated input, replaces the real one"""
+    wall = collections.defaultdict(list)
+    cpu = collections.defaultdict(list)
+    gc_time = collections.defaultdict(list)
+
+    for n in range(warmup + repeat):
+        problem = problem_cls(test=test)
+        problem.use_cache = use_cache
+        if input_f:
+            problem.input_f = input_f
+
+        # Decompression happens while parsing, hence it is timed on its own to tell them apart
+        if n >= warmup and problem.input_path.suffix in lib.COMPRESSIONS:
+            decompress_wall, decompress_cpu = _decompression_time(problem.input_path)
+            wall[DECOMPRESS].append(decompress_wall)
+            cpu[DECOMPRESS].append(decompress_cpu)
+
+        with runner.silenced():
+            stage_results = problem.run(probes, fused=fused)
+
+        if n < warmup:
+            continue
+
+        for stage_result in stage_results:
+            wall[stage_result.stage].append(stage_result.elapsed)
+            cpu[stage_result.stage].append(stage_result.cpu)
+            if gc_report := stage_result.reports.get('gc'):
+                gc_time[stage_result.stage].append(gc_report['time'])
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    return {
+        'repeat': repeat,
+        'warmup': warmup,
+        'test': test,
+        'cache': use_cache,
+        'stages': {stage: {'wall': _stats(wall[stage]), 'cpu': _stats(cpu[stage])} |
+                          ({'gc': _stats(gc_time[stage])} if stage in gc_time else {}) for stage in wall},
+        'max_rss_kib': usage.ru_maxrss,
+    }
+
+
+# Pseudo-stage of the benchmarks of compressed inputs: reading the whole input without parsing it
+DECOMPRESS = 'decompress'
+
+
+def _decompression_time(f) -> tuple[float, float]:
+    """Wall and CPU seconds"""
+    cpu_start = time.process_time()
+    time_start = time.perf_counter()
+    with lib.open_input(f, 'rb') as f_in:
+        while f_in.read(lib.INPUT_BUFFER_SIZE):
+            pass
+    return time.perf_counter() - time_start, time.process_time() - cpu_start
+
+
+def _stats(samples: list[float]) -> dict:
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'p95': statistics.quantiles(samples, n=20, method='inclusive')[-1] if len(samples) > 1 else samples[0],
+        'mean': statistics.fmean(samples),
+        'stddev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'samples': samples,
+    }
+
+
+# Stages faster than this are dominated by noise and overheads, hence left out of the fits
+MIN_FIT_TIME = 1e-3
+
+# How far over the expected exponent a stage can be before it is flagged
+EXPONENT_TOLERANCE = 0.3
+
+
+def fit_exponent(scales: list[float], times: list[float | None]) -> float | None:
+    """Slope of log(time) against log(scale), i.e. k in time ~ scale ** k"""
+    points = [(math.log(scale), math.log(t)) for scale, t in zip(scales, times) if t is not None and t >= MIN_FIT_TIME]
+    if len(points) < 2:
+        return None
+
+    return statistics.linear_regression(*zip(*points)).slope
+
+
+def complexity(problem_cls: type[lib.AOCProblem], day: str, scales: list[float], repeat=3, warmup=1, seed=0,
+               timeout=None, fused=True) -> dict:
+    """Median stage times on generated inputs of growing scales, and the exponent fitted to each stage. The series
+    stops at the first scale with a stage over the timeout"""
+    import generate
+
+    probes = (functools.partial(lib.limits_probe, timeout=timeout),) if timeout else ()
+
+    scales = sorted(scales)
+    times = collections.defaultdict(dict)
+    timed_out = None
+
+    for scale in scales:
+        input_f = generate.write(day, scale, seed)
+        try:
+            report = benchmark(problem_cls, repeat=repeat, warmup=warmup, fused=fused, input_f=input_f, probes=probes)
+        except lib.StageTimeout as e:
+            timed_out = f'x{scale:g}: {e}'
+            break
+
+        for stage, stats in report['stages'].items():
+            times[stage][scale] = stats['wall']['median']
+
+    scales = [scale for scale in scales if any(scale in stage_times for stage_times in times.values())]
+
+    stages = {}
+    for stage, stage_times in times.items():
+        stage_times = [stage_times.get(scale) for scale in scales]
+        exponent = fit_exponent(scales, stage_times)
+        expected = problem_cls.EXPECTED_EXPONENTS.get(stage, 1.0)
+
+        stages[stage] = {
+            'times': stage_times,
+            'exponent': exponent,
+            'expected': expected,
+            'flagged': exponent is not None and exponent > expected + EXPONENT_TOLERANCE,
+        }
+
+    return {
+        'repeat': repeat,
+        'warmup': warmup,
+        'seed': seed,
+        'scales': scales,
+        'timed_out': timed_out,
+        'stages': stages,
+    }
+
+
+def print_complexity_report(report: dict):
+    print(f'{report["day"]}: median time of {report["repeat"]} runs per scale of the input. '
+          f'Exponents k of time ~ scale ** k')
+    print(f'{"Stage":10} ' + ' '.join(f'{f"x{scale:g}":>10}' for scale in report['scales']) +
+          f' {"k":>6} {"expected":>8}')
+
+    for stage, stats in report['stages'].items():
+        times = ' '.join(f'{t:10.6f}' if t is not None else f'{"-":>10}' for t in stats['times'])
+        exponent = f'{stats["exponent"]:6.2f}' if stats['exponent'] is not None else f'{"-":>6}'
+        flag = '  WORSE THAN EXPECTED' if stats['flagged'] else ''
+        print(f'{stage:10} {times} {exponent} {stats["expected"]:8.2f}{flag}')
+
+    if report['timed_out']:
+        print(f'Stopped at {report["timed_out"]}')
+
+
+def scaling(problem_cls: type[lib.AOCProblem], workers: list[int], repeat=3, warmup=1, input_f=None,
+            fused=True) -> dict:
+    """Median stage times with every lib.parallel_map backend and number of workers. The serial backend, the
+    baseline, is only run once"""
+    runs = []
+    for backend in lib.PARALLEL_BACKENDS:
+        for n_workers in ([1] if backend == 'serial' else workers):
+            environ = {'AOC_PARALLEL': backend, 'AOC_WORKERS': str(n_workers)}
+            previous_environ = {name: os.environ.get(name) for name in environ}
+            os.environ.update(environ)
+            try:
+                report = benchmark(problem_cls, repeat=repeat, warmup=warmup, fused=fused, input_f=input_f)
+            finally:
+                for name, value in previous_environ.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+
+            runs.append({'backend': backend, 'workers': n_workers,
+                         'stages': {stage: stats['wall']['median'] for stage, stats in report['stages'].items()}})
+
+    return {
+        'repeat': repeat,
+        'warmup': warmup,
+        'free_threaded': lib.free_threaded(),
+        'cpus': os.cpu_count(),
+        'runs': runs,
+    }
+
+
+def print_scaling_report(report: dict):
+    print(f'{report["day"]}: median time of {report["repeat"]} runs per backend and workers. '
+          f'{report["cpus"]} CPUs, {"free-threaded" if report["free_threaded"] else "GIL"} interpreter')
+
+    stages = list(report['runs'][0]['stages'])
+    baseline = sum(report['runs'][0]['stages'].values())
+
+    print(f'{"Backend":8} {"Workers":>7} ' + ' '.join(f'{stage:>10}' for stage in stages) + f' {"Speedup":>8}')
+    for run in report['runs']:
+        total = sum(run['stages'].values())
+        print(f'{run["backend"]:8} {run["workers"]:7d} ' +
+              ' '.join(f'{run["stages"].get(stage, 0):10.6f}' for stage in stages) +
+              f' {baseline / total if total else float("inf"):8.3f}')
+
+
+def compare_complexity(before: dict, after: dict):
+    print(f'{before["day"]} @ {before["commit"]} -> {after["day"]} @ {after["commit"]}')
+    print(f'{"Stage":10} {"k before":>8} {"k after":>8}')
+
+    def exponent_str(report, stage):
+        exponent = report['stages'].get(stage, {}).get('exponent')
+        return f'{exponent:8.2f}' if exponent is not None else f'{"-":>8}'
+
+    for stage in after['stages']:
+        print(f'{stage:10} {exponent_str(before, stage)} {exponent_str(after, stage)}')
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=runner.ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# What a fresh interpreter runs to import a day, like `python YYYY/DD.py` does before solving anything
+_IMPORT_DAY_CODE = """
+import importlib.util, sys
+sys.path.insert(0, {root!r})
+spec = importlib.util.spec_from_file_location('day', {day_f!r})
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+"""
+
+
+def _import_times(code: str) -> tuple[float, dict]:
+    """Wall time of a fresh interpreter running code, and (self, cumulative) import µs per module it imported"""
+    # Without bytecode caches the compilation of the sources would be measured instead of the imports
+    env = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+
+    time_start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=runner.ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - time_start
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        self_us, cumulative_us, module = line.removeprefix('import time:').split('|')
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+
+    return wall, times
+
+
+def startup(day_f, repeat=10, warmup=1) -> dict:
+    """Startup of a fresh interpreter importing a day (and lib, and whatever they import), against a bare one.
+    Import times are the medians across repetitions, in µs"""
+    code = _IMPORT_DAY_CODE.format(root=str(runner.ROOT), day_f=str(day_f))
+
+    walls, bare_walls = [], []
+    samples = collections.defaultdict(list)
+
+    for n in range(warmup + repeat):
+        bare_wall, _ = _import_times('pass')
+        wall, times = _import_times(code)
+
+        if n < warmup:
+            continue
+
+        walls.append(wall)
+        bare_walls.append(bare_wall)
+        for module, module_times in times.items():
+            samples[module].append(module_times)
+
+    return {
+        'repeat': repeat,
+        'warmup': warmup,
+        'wall': _stats(walls),
+        'bare_wall': _stats(bare_walls),
+        'imports': {module: {'self': statistics.median(s for s, _ in module_samples),
+                             'cumulative': statistics.median(c for _, c in module_samples)}
+                    for module, module_samples in samples.items()},
+    }
+
+
+def print_startup_report(report: dict, n_top=25):
+    wall = report['wall']['median']
+    bare_wall = report['bare_wall']['median']
+    print(f'{report["day"]}: startup {wall * 1000:.1f} ms, of which {(wall - bare_wall) * 1000:.1f} ms over a bare '
+          f'interpreter. Median of {report["repeat"]}')
+    print(f'{"self ms":>9} {"cumul ms":>9}  module')
+
+    by_cumulative = sorted(report['imports'].items(), key=lambda item: item[1]['cumulative'], reverse=True)
+    for module, times in by_cumulative[:n_top]:
+        print(f'{times["self"] / 1000:9.2f} {times["cumulative"] / 1000:9.2f}  {module}')
+
+
+def compare_startup(before: dict, after: dict, n_top=10):
+    """Startup wall times, and the imports whose cumulative time changed the most"""
+    print(f'{before["day"]} @ {before["commit"]} -> {after["day"]} @ {after["commit"]}')
+    print(f'Startup: {before["wall"]["median"] * 1000:.1f} ms -> {after["wall"]["median"] * 1000:.1f} ms')
+
+    def cumulative(report, module):
+        return report['imports'].get(module, {}).get('cumulative', 0)
+
+    modules = before['imports'].keys() | after['imports'].keys()
+    by_delta = sorted(modules, key=lambda m: abs(cumulative(after, m) - cumulative(before, m)), reverse=True)
+
+    print(f'{"Before ms":>9} {"After ms":>9}  module')
+    for module in by_delta[:n_top]:
+        print(f'{cumulative(before, module) / 1000:9.2f} {cumulative(after, module) / 1000:9.2f}  {module}')
+
+
+def compare(before: dict, after: dict):
+    """Speedup per stage (>1 means faster). A change is only significant if the [min, p95] ranges do not overlap"""
+    if 'imports' in before and 'imports' in after:
+        return compare_startup(before, after)
+    if 'scales' in before and 'scales' in after:
+        return compare_complexity(before, after)
+
+    print(f'{before["day"]} @ {before["commit"]} -> {after["day"]} @ {after["commit"]}')
+    print(f'{"Stage":10} {"Before":>10} {"After":>10} {"Speedup":>8}  Significant')
+
+    for stage, stats_after in after['stages'].items():
+        if not (stats_before := before['stages'].get(stage)):
+            continue
+
+        wall_before = stats_before['wall']
+        wall_after = stats_after['wall']
+
+        speedup = wall_before['median'] / wall_after['median'] if wall_after['median'] else float('inf')
+        significant = wall_after['p95'] < wall_before['min'] or wall_before['p95'] < wall_after['min']
+
+        print(f'{stage:10} {wall_before["median"]:10.6f} {wall_after["median"]:10.6f} {speedup:8.3f}  '
+              f'{"yes" if significant else "no (noise)"}')
+
+
+def print_report(report: dict):
+    print(f'{report["day"]}: {report["repeat"]} repetitions after {report["warmup"]} warmup. '
+          f'Max RSS {report["max_rss_kib"] / 1024:.1f} MiB')
+    if gc_mode := report.get('gc'):
+        print(f'GC {gc_mode}')
+    print(f'{"Stage":10} {"min":>10} {"median":>10} {"p95":>10} {"stddev":>10} {"cpu med":>10} {"gc med":>10}')
+
+    for stage, stats in report['stages'].items():
+        wall = stats['wall']
+        gc_str = f'{stats["gc"]["median"]:10.6f}' if 'gc' in stats else f'{"-":>10}'
+        print(f'{stage:10} {wall["min"]:10.6f} {wall["median"]:10.6f} {wall["p95"]:10.6f} {wall["stddev"]:10.6f} '
+              f'{stats["cpu"]["median"]:10.6f} {gc_str}')
+
+    if decompress := report['stages'].get(DECOMPRESS):
+        parsing_stage = 'load_data' if 'load_data' in report['stages'] else 'solve_both'
+        parsing = report['stages'][parsing_stage]['wall']['median'] - decompress['wall']['median']
+        print(f'{parsing_stage} decompresses the input as it reads it. Without the decompression: {parsing:.6f} s')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('day', nargs='?', help='Day to benchmark, e.g. 2023/05')
+    parser.add_argument('-n', '--repeat', type=int, help='10 by default, 3 per scale with --complexity')
+    parser.add_argument('-w', '--warmup', type=int, help='2 by default, 1 per scale with --complexity')
+    parser.add_argument('-t', '--test', action='store_true', help='Use the test input')
+    parser.add_argument('-i', '--input', type=Path, help='Input to use instead of the real one, e.g. a generated one')
+    parser.add_argument('--cache', action='store_true', help='Restore the state parsed by load_data from the cache')
+    parser.add_argument('--no-fuse', action='store_true', help='Run the stages one by one even if there is solve_both')
+    parser.add_argument('-o', '--output', help='JSON file to write the results to')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two JSON results')
+    parser.add_argument('--startup', action='store_true',
+                        help='Measure the import time of the day in fresh interpreters instead of its stages')
+    parser.add_argument('--complexity', action='store_true',
+                        help='Fit how the time of the stages grows with the size of generated inputs')
+    parser.add_argument('--scaling', action='store_true',
+                        help='Time the stages with every backend of lib.parallel_map and number of workers')
+    parser.add_argument('--workers', type=int, nargs='+', help='Numbers of workers for --scaling. Powers of 2 up to '
+                                                                 'the number of CPUs by default')
+    parser.add_argument('-x', '--scales', type=float, nargs='+', default=[0.25, 0.5, 1, 2, 4],
+                        help='Scales of the generated inputs, times the size of the real ones')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='Seed of the generated inputs')
+    parser.add_argument('--gc', choices=lib.GC_MODES,
+                        help='Run the garbage collector as usual, disabled or frozen during every stage, timing it')
+    parser.add_argument('--gc-thresholds', type=int, nargs=3, metavar=('GEN0', 'GEN1', 'GEN2'),
+                        help='Thresholds of the garbage collector during every stage. Implies --gc default')
+    parser.add_argument('--timeout', type=float, default=30,
+                        help='Seconds per stage after which --complexity stops growing the input')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f_before, open(args.compare[1]) as f_after:
+            compare(json.load(f_before), json.load(f_after))
+        return
+
+    if not args.day:
+        parser.error('A day is needed unless comparing')
+    if args.test and args.input:
+        parser.error('-t and -i are alternative inputs')
+
+    day_f = runner.find_day(args.day)
+    repeat = args.repeat or (3 if args.complexity or args.scaling else 10)
+    warmup = args.warmup if args.warmup is not None else (1 if args.complexity or args.scaling else 2)
+    report = {'day': args.day, 'commit': _git_commit(), 'python': platform.python_version()}
+
+    if args.startup:
+        report.update(startup(day_f, repeat=repeat, warmup=warmup))
+        print_startup_report(report)
+
+    elif args.complexity:
+        report.update(complexity(runner.load_problem_class(day_f), args.day, args.scales, repeat=repeat, warmup=warmup,
+                                 seed=args.seed, timeout=args.timeout, fused=not args.no_fuse))
+        print_complexity_report(report)
+
+    elif args.scaling:
+        workers = args.workers or [2 ** n for n in range(int(math.log2(os.cpu_count() or 1)) + 1)]
+        report.update(scaling(runner.load_problem_class(day_f), workers, repeat=repeat, warmup=warmup,
+                              input_f=args.input, fused=not args.no_fuse))
+        print_scaling_report(report)
+
+    else:
+        probes = ()
+        if gc_mode := args.gc or ('default' if args.gc_thresholds else None):
+            report['gc'] = gc_mode
+            probes = (functools.partial(lib.gc_probe, mode=gc_mode, thresholds=args.gc_thresholds),)
+
+        report.update(benchmark(runner.load_problem_class(day_f), repeat=repeat, warmup=warmup,
+                                test=args.test, use_cache=args.cache, fused=not args.no_fuse, input_f=args.input,
+                                probes=probes))
+        print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
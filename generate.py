@@ -0,0 +1,579 @@
+""" Seeded generators of inputs for every day, valid for its parser, at any scale of the size of the real inputs. They
+are meant to load test the solvers, as the real inputs are too small to show their quadratic and exponential spots.
+
+    python generate.py 2023/11 -x 100          # Writes generated/2023/11.x100.s0.txt, 100 times the real size
+    python generate.py 2023/11 -x 100 --run    # And solves it, timing the stages
+    python generate.py --all -x 10
+    python generate.py --all --run --timeout 5  # Giving up on the stages taking longer than 5 s
+
+The scale applies to the amount of data: lines or blocks, or the cells of grids, whose sides grow as its square root.
+"""
+
+import argparse
+import functools
+import math
+import random
+import string
+import sys
+import time
+
+from pathlib import Path
+
+import lib
+import runner
+
+GENERATED_DIR = runner.ROOT / 'generated'
+
+GENERATORS = {}
+
+
+def generator(day: str):
+    """Registers the generator of a day, a function of a random.Random and the scale returning the input text"""
+    def register(f):
+        GENERATORS[day] = f
+        return f
+
+    return register
+
+
+def generate(day: str, scale=1.0, seed=0) -> str:
+    if day not in GENERATORS:
+        raise KeyError(f'No generator for {day}')
+    return GENERATORS[day](random.Random(f'{day}/{seed}'), scale)
+
+
+def generated_f(day: str, scale=1.0, seed=0, compression: str = None) -> Path:
+    """compression is one of the suffixes in lib.COMPRESSIONS, if any"""
+    year, day_n = day.split('/')
+    return GENERATED_DIR / year / f'{day_n}.x{scale:g}.s{seed}.txt{compression or ""}'
+
+
+def write(day: str, scale=1.0, seed=0, compression: str = None) -> Path:
+    """The generated input file, written unless it already was"""
+    if (f := generated_f(day, scale, seed, compression)).exists():
+        return f
+
+    f.parent.mkdir(parents=True, exist_ok=True)
+    if compression:
+        import importlib
+
+        with importlib.import_module(lib.COMPRESSIONS[compression]).open(f, 'wt') as f_out:
+            f_out.write(generate(day, scale, seed))
+    else:
+        f.write_text(generate(day, scale, seed))
+
+    return f
+
+
+def problem_for(problem_cls: type[lib.AOCProblem], input_f: Path) -> lib.AOCProblem:
+    """An instance of the day solving input_f instead of its real input"""
+    problem = problem_cls(test=False)
+    problem.input_f = input_f
+    return problem
+
+
+def _n(real: int, scale: float) -> int:
+    """Amount of items at the scale"""
+    return max(1, round(real * scale))
+
+
+def _side(real: int, scale: float) -> int:
+    """Side of a grid at the scale, the cells growing linearly with it"""
+    return max(3, round(real * math.sqrt(scale)))
+
+
+def _primes(n: int, start=2) -> list[int]:
+    primes = []
+    candidate = start
+    while len(primes) < n:
+        if candidate > 1 and all(candidate % d for d in range(2, math.isqrt(candidate) + 1)):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _names(rng: random.Random, n: int, length: int, alphabet=string.ascii_lowercase) -> list[str]:
+    names = set()
+    while len(names) < n:
+        names.add(''.join(rng.choices(alphabet, k=length)))
+    return sorted(names)
+
+
+@generator('2022/01')
+def _calories(rng, scale):
+    elves = ('\n'.join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15)))
+             for _ in range(_n(250, scale)))
+    return '\n\n'.join(elves) + '\n'
+
+
+@generator('2022/02')
+def _strategy_guide(rng, scale):
+    return ''.join(f'{rng.choice("ABC")} {rng.choice("XYZ")}\n' for _ in range(_n(2500, scale)))
+
+
+@generator('2022/04')
+def _section_pairs(rng, scale):
+    lines = []
+    for _ in range(_n(1000, scale)):
+        a, b = sorted(rng.sample(range(1, 100), 2))
+        c, d = sorted(rng.sample(range(1, 100), 2))
+        lines.append(f'{a}-{b},{c}-{d}')
+    return '\n'.join(lines) + '\n'
+
+
+@generator('2022/07')
+def _terminal(rng, scale):
+    n_dirs = _n(180, scale)
+    n_files = _n(300, scale)
+    name_length = max(3, math.ceil(math.log(n_dirs + n_files, 26)) + 1)
+
+    children = [[] for _ in range(n_dirs)]  # Directory 0 is /
+    files = [[] for _ in range(n_dirs)]
+    names = iter(_names(rng, n_dirs + n_files, name_length))
+
+    for d in range(1, n_dirs):
+        children[rng.randrange(d)].append((d, next(names)))  # Random parents make the depth logarithmic
+    for _ in range(n_files):
+        files[rng.randrange(n_dirs)].append((rng.randint(1000, 300000), f'{next(names)}.{rng.choice(("txt", "dat"))}'))
+
+    lines = ['$ cd /']
+    stack = [(0, None)]
+    while stack:
+        d, name = stack.pop()
+        if d is None:
+            lines.append('$ cd ..')
+            continue
+
+        if name:
+            lines.append(f'$ cd {name}')
+        lines.append('$ ls')
+        lines.extend(f'dir {child_name}' for _, child_name in children[d])
+        lines.extend(f'{size} {file_name}' for size, file_name in files[d])
+
+        if name:
+            stack.append((None, None))
+        stack.extend(reversed(children[d]))
+
+    return '\n'.join(lines) + '\n'
+
+
+@generator('2022/08')
+def _forest(rng, scale):
+    side = _side(99, scale)
+    return ''.join(''.join(rng.choices('0123456789', k=side)) + '\n' for _ in range(side))
+
+
+@generator('2022/09')
+def _rope_moves(rng, scale):
+    return ''.join(f'{rng.choice("UDLR")} {rng.randint(1, 19)}\n' for _ in range(_n(2000, scale)))
+
+
+@generator('2022/10')
+def _cpu_instructions(rng, scale):
+    return ''.join('noop\n' if rng.random() < 0.3 else f'addx {rng.randint(-20, 20)}\n'
+                   for _ in range(_n(140, scale)))
+
+
+@generator('2022/11')
+def _monkeys(rng, scale):
+    n_monkeys = max(3, _n(8, scale))
+    mods = _primes(n_monkeys)
+    rng.shuffle(mods)
+
+    # Only one, which no monkey throws to, so each item is squared once at most. Or the worry levels would explode
+    squaring_monkey = rng.randrange(n_monkeys)
+
+    blocks = []
+    for n, mod in enumerate(mods):
+        others = [m for m in range(n_monkeys) if m not in (n, squaring_monkey)]
+        true_monkey, false_monkey = rng.sample(others, 2) if len(others) > 1 else others * 2
+        operation = ('old * old' if n == squaring_monkey else
+                     rng.choice((f'old * {rng.randint(2, 19)}', f'old + {rng.randint(1, 8)}')))
+
+        blocks.append(f'Monkey {n}:\n'
+                      f'  Starting items: {", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))}\n'
+                      f'  Operation: new = {operation}\n'
+                      f'  Test: divisible by {mod}\n'
+                      f'    If true: throw to monkey {true_monkey}\n'
+                      f'    If false: throw to monkey {false_monkey}\n')
+
+    return '\n'.join(blocks)
+
+
+@generator('2022/12')
+def _heightmap(rng, scale):
+    height = _side(41, scale)
+    width = max(26, _side(160, scale))  # Wide enough to rise from a to z one step at a time
+
+    # Rising from west to east, with some noise but in the row of the start and the end, not to leave it out of reach
+    path_y = rng.randrange(height)
+
+    rows = []
+    for y in range(height):
+        noise = 1 if y != path_y else 0
+        rows.append([string.ascii_lowercase[min(25, max(0, 26 * x // width + rng.randint(-noise, noise)))]
+                     for x in range(width)])
+
+    rows[path_y][0] = 'S'
+    rows[path_y][width - 1] = 'E'
+
+    return ''.join(''.join(row) + '\n' for row in rows)
+
+
+_DIGIT_NAMES = ('one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine')
+
+
+@generator('2023/01')
+def _calibration(rng, scale):
+    lines = []
+    for _ in range(_n(1000, scale)):
+        chunks = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(0, 6))) for _ in range(rng.randint(1, 4))]
+        chunks.extend(rng.choice(_DIGIT_NAMES) for _ in range(rng.randint(0, 3)))
+        chunks.extend(str(rng.randint(1, 9)) for _ in range(rng.randint(1, 3)))  # At least one digit, for part 1
+        rng.shuffle(chunks)
+        lines.append(''.join(chunks))
+    return '\n'.join(lines) + '\n'
+
+
+@generator('2023/02')
+def _cube_games(rng, scale):
+    lines = []
+    for game in range(1, _n(100, scale) + 1):
+        plays = []
+        for _ in range(rng.randint(1, 6)):
+            colours = rng.sample(('red', 'green', 'blue'), rng.randint(1, 3))
+            plays.append(', '.join(f'{rng.randint(1, 20)} {colour}' for colour in colours))
+        lines.append(f'Game {game}: {"; ".join(plays)}')
+    return '\n'.join(lines) + '\n'
+
+
+@generator('2023/03')
+def _engine_schematic(rng, scale):
+    side = _side(140, scale)
+
+    rows = []
+    for _ in range(side):
+        row = ''
+        while len(row) < side:
+            if (r := rng.random()) < 0.15:
+                row += str(rng.randint(1, 999)) + '.'  # Numbers on a row are always apart
+            elif r < 0.22:
+                row += rng.choice('*#+$/@%=&-')
+            else:
+                row += '.'
+        rows.append(row[:side])
+
+    return '\n'.join(rows) + '\n'
+
+
+@generator('2023/04')
+def _scratchcards(rng, scale):
+    n_cards = _n(200, scale)
+
+    lines = []
+    for i in range(n_cards):
+        # Cards cannot win copies of cards past the end of the table
+        n_matches = min(rng.choice((0, 0, 0, 1, 2, 3, 4, 5, 7, 10)), n_cards - 1 - i)
+
+        numbers = rng.sample(range(1, 100), 35 - n_matches)
+        winning = numbers[:10]
+        mine = winning[:n_matches] + numbers[10:]
+        rng.shuffle(mine)
+
+        lines.append(f'Card {i + 1:3d}: {" ".join(f"{n:2d}" for n in winning)} | {" ".join(f"{n:2d}" for n in mine)}')
+
+    return '\n'.join(lines) + '\n'
+
+
+_ALMANAC_CATEGORIES = ('seed', 'soil', 'fertilizer', 'water', 'light', 'temperature', 'humidity', 'location')
+
+
+@generator('2023/05')
+def _almanac(rng, scale):
+    top = 2 ** 32
+    n_ranges = max(2, _n(30, scale))
+    n_seed_ranges = _n(10, scale)
+
+    seeds = []
+    for _ in range(n_seed_ranges):
+        start = rng.randrange(top)
+        seeds.extend((start, rng.randint(1, max(1, (top - start) // (8 * n_seed_ranges)))))
+
+    blocks = [f'seeds: {" ".join(map(str, seeds))}\n']
+    for src, dst in zip(_ALMANAC_CATEGORIES, _ALMANAC_CATEGORIES[1:]):
+        # The source is cut in contiguous ranges, which the destination puts in another order
+        cuts = [0] + sorted(rng.sample(range(1, top), n_ranges - 1)) + [top]
+        src_ranges = list(zip(cuts, cuts[1:]))
+        dst_order = rng.sample(src_ranges, len(src_ranges))
+
+        lines = [f'{src}-to-{dst} map:']
+        dst_start = 0
+        for src_start, src_end in dst_order:
+            lines.append(f'{dst_start} {src_start} {src_end - src_start}')
+            dst_start += src_end - src_start
+
+        blocks.append('\n'.join(lines) + '\n')
+
+    return '\n'.join(blocks)
+
+
+@generator('2023/06')
+def _races(rng, scale):
+    """Part 2 goes through every time of the race made of all the digits, hence the last time grows with the scale"""
+    times = [rng.randint(40, 99) for _ in range(3)] + [_n(rng.randint(40, 99), scale)]
+    distances = [rng.randint(time ** 2 // 8, max(time ** 2 // 8, time ** 2 // 4 - 1)) for time in times]
+
+    return (f'Time:     {" ".join(f"{t:6d}" for t in times)}\n'
+            f'Distance: {" ".join(f"{d:6d}" for d in distances)}\n')
+
+
+@generator('2023/07')
+def _camel_cards(rng, scale):
+    return ''.join(f'{"".join(rng.choices("AKQJT98765432", k=5))} {rng.randint(1, 1000)}\n'
+                   for _ in range(_n(1000, scale)))
+
+
+@generator('2023/08')
+def _network(rng, scale):
+    """Every ghost walks from its start node into a ring ending in its end node, whose length is a distinct prime. Both
+    children of a node are the next one in the ring, hence the instructions do not matter, as their phase does not
+    repeat with the ring"""
+    n_ghosts = 6
+    ring_lengths = _primes(n_ghosts, start=max(2, _n(750, scale) // n_ghosts))
+
+    length = 3
+    while 26 ** (length - 1) * 24 < 2 * sum(ring_lengths):
+        length += 1
+
+    # Only the starts and the ends may end in A and Z
+    inner_names = set()
+    while len(inner_names) < sum(ring_lengths):
+        inner_names.add(''.join(rng.choices(string.ascii_uppercase, k=length - 1)) +
+                        rng.choice(string.ascii_uppercase[1:-1]))
+    inner_names = iter(sorted(inner_names))
+
+    nodes = []
+    for ghost, ring_length in enumerate(ring_lengths):
+        start = 'A' * length if not ghost else f'{ghost:0{length - 1}d}A'
+        end = 'Z' * length if not ghost else f'{ghost:0{length - 1}d}Z'
+        ring = [next(inner_names) for _ in range(ring_length - 1)] + [end]
+
+        nodes.append((start, ring[0]))
+        nodes.extend((node, next_node) for node, next_node in zip(ring, ring[1:] + ring[:1]))
+
+    rng.shuffle(nodes)
+    instructions = ''.join(rng.choices('LR', k=rng.randint(250, 300)))
+
+    return instructions + '\n\n' + ''.join(f'{node} = ({next_node}, {next_node})\n' for node, next_node in nodes)
+
+
+@generator('2023/09')
+def _oasis_histories(rng, scale):
+    lines = []
+    for _ in range(_n(200, scale)):
+        # Polynomials in the binomial basis take integer values
+        coefficients = [rng.randint(-5, 15) for _ in range(rng.randint(1, 8))]
+        values = [sum(c * math.comb(x, k) for k, c in enumerate(coefficients)) for x in range(21)]
+        lines.append(' '.join(map(str, values)))
+    return '\n'.join(lines) + '\n'
+
+
+_PIPES = {frozenset('NS'): '|', frozenset('EW'): '-', frozenset('NE'): 'L', frozenset('NW'): 'J',
+          frozenset('SW'): '7', frozenset('SE'): 'F'}
+
+
+@generator('2023/10')
+def _pipe_maze(rng, scale):
+    """The loop is the contour of a random spanning tree of a coarser grid, drawn with one-cell-wide corridors. As a
+    tree has no holes and corridors only touch diagonally through a shared cell, its contour is a single simple loop"""
+    side = _side(140, scale)
+    coarse = (side - 2) // 2
+
+    # Randomised depth-first spanning tree. Cell (i, j) is (2i + 1, 2j + 1), and the link to its neighbour in between
+    cells = {(1, 1)}
+    stack = [(0, 0)]
+    visited = {(0, 0)}
+    while stack:
+        i, j = stack[-1]
+        neighbours = [(i + di, j + dj) for di, dj in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                      if 0 <= i + di < coarse and 0 <= j + dj < coarse and (i + di, j + dj) not in visited]
+        if not neighbours:
+            stack.pop()
+            continue
+
+        ni, nj = rng.choice(neighbours)
+        visited.add((ni, nj))
+        cells.add((2 * ni + 1, 2 * nj + 1))
+        cells.add((i + ni + 1, j + nj + 1))
+        stack.append((ni, nj))
+
+    # The contour goes through the corners of the cells, which are the tiles of the maze
+    links = {}
+    for y, x in cells:
+        for (dy, dx), corners in (((-1, 0), ((y, x), (y, x + 1))), ((1, 0), ((y + 1, x), (y + 1, x + 1))),
+                                  ((0, -1), ((y, x), (y + 1, x))), ((0, 1), ((y, x + 1), (y + 1, x + 1)))):
+            if (y + dy, x + dx) not in cells:
+                a, b = corners
+                links.setdefault(a, []).append(b)
+                links.setdefault(b, []).append(a)
+
+    tiles = [[rng.choice('|-LJ7F...') for _ in range(side)] for _ in range(side)]
+    for (y, x), (a, b) in links.items():
+        tiles[y][x] = _PIPES[frozenset(_towards((y, x), a) + _towards((y, x), b))]
+
+    start_y, start_x = rng.choice(sorted(links))
+    tiles[start_y][start_x] = 'S'
+    for dy, dx in ((-1, 0), (1, 0), (0, -1), (0, 1)):  # Only the loop connects with the start
+        if (start_y + dy, start_x + dx) not in links and 0 <= start_y + dy < side and 0 <= start_x + dx < side:
+            tiles[start_y + dy][start_x + dx] = '.'
+
+    return ''.join(''.join(row) + '\n' for row in tiles)
+
+
+def _towards(tile: tuple, other: tuple) -> str:
+    (y, x), (other_y, other_x) = tile, other
+    return 'N' if other_y < y else 'S' if other_y > y else 'W' if other_x < x else 'E'
+
+
+@generator('2023/11')
+def _galaxies(rng, scale):
+    side = _side(140, scale)
+    empty_rows = set(rng.sample(range(side), side // 20))
+    empty_cols = set(rng.sample(range(side), side // 20))
+
+    return ''.join(''.join('#' if y not in empty_rows and x not in empty_cols and rng.random() < 0.025 else '.'
+                           for x in range(side)) + '\n' for y in range(side))
+
+
+@generator('2023/12')
+def _spring_records(rng, scale):
+    lines = []
+    for _ in range(_n(1000, scale)):
+        springs = ''.join(rng.choices('#.', k=rng.randint(5, 20)))
+        if '#' not in springs:
+            springs = '#' + springs[1:]
+
+        groups = [len(group) for group in springs.split('.') if group]
+        record = ''.join('?' if rng.random() < 0.4 else c for c in springs)
+        lines.append(f'{record} {",".join(map(str, groups))}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _mismatches(rows: list, line: int) -> int:
+    """Cells that differ between the rows reflected over the line between rows line - 1 and line"""
+    return sum(a != b for i in range(min(line, len(rows) - line))
+               for a, b in zip(rows[line - 1 - i], rows[line + i]))
+
+
+@generator('2023/13')
+def _mirror_patterns(rng, scale):
+    """Every pattern reflects over a row, and over a column but for a smudge. The smudge is placed where the row
+    reflection does not reach, hence it only breaks the column one"""
+    patterns = []
+
+    while len(patterns) < _n(100, scale):
+        height = _side(rng.randint(7, 17), math.sqrt(scale))
+        width = _side(rng.randint(7, 17), math.sqrt(scale))
+        row_line = rng.randint(1, height - 1)
+        col_line = rng.randint(1, width - 1)
+
+        rows = [[rng.choice('#.') for _ in range(width)] for _ in range(height)]
+        for i in range(min(row_line, height - row_line)):
+            rows[row_line + i] = rows[row_line - 1 - i].copy()
+        for row in rows:
+            for j in range(min(col_line, width - col_line)):
+                row[col_line + j] = row[col_line - 1 - j]
+
+        row_reach = min(row_line, height - row_line)
+        if not (unreflected_rows := [y for y in range(height) if not row_line - row_reach <= y < row_line + row_reach]):
+            continue
+
+        col_reach = min(col_line, width - col_line)
+        y = rng.choice(unreflected_rows)
+        x = rng.randrange(col_line - col_reach, col_line + col_reach)
+        rows[y][x] = '#' if rows[y][x] == '.' else '.'
+
+        cols = [list(col) for col in zip(*rows)]
+        row_mismatches = [_mismatches(rows, line) for line in range(1, height)]
+        col_mismatches = [_mismatches(cols, line) for line in range(1, width)]
+
+        # Only the intended reflections, not any made by chance
+        mismatches = row_mismatches + col_mismatches
+        if mismatches.count(0) != 1 or mismatches.count(1) != 1 or row_mismatches[row_line - 1]:
+            continue
+
+        if rng.random() < 0.5:
+            rows = cols  # Transposed, for the reflections to be over columns as often as over rows
+
+        patterns.append('\n'.join(''.join(row) for row in rows) + '\n')
+
+    return '\n'.join(patterns)
+
+
+@generator('2023/14')
+def _rocks(rng, scale):
+    side = _side(100, scale)
+    return ''.join(''.join(rng.choices('O#.', weights=(20, 8, 72), k=side)) + '\n' for _ in range(side))
+
+
+@generator('2023/15')
+def _init_sequence(rng, scale):
+    labels = _names(rng, 500, 4)
+    steps = (f'{rng.choice(labels)}={rng.randint(1, 9)}' if rng.random() < 0.6 else f'{rng.choice(labels)}-'
+             for _ in range(_n(4000, scale)))
+    return ','.join(steps) + '\n'
+
+
+@generator('2023/16')
+def _contraption(rng, scale):
+    side = _side(110, scale)
+    return ''.join(''.join(rng.choices('./\\|-', weights=(84, 4, 4, 4, 4), k=side)) + '\n' for _ in range(side))
+
+
+def solve(problem: lib.AOCProblem, timeout: float = None) -> list[lib.StageResult]:
+    """A stage going over timeout seconds raises lib.StageTimeout"""
+    probes = (functools.partial(lib.limits_probe, timeout=timeout),) if timeout else ()
+    with runner.silenced():
+        return problem.run(probes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('days', nargs='*', help='Days to generate inputs for, e.g. 2023/11')
+    parser.add_argument('--all', action='store_true', help='Every day with a generator')
+    parser.add_argument('-x', '--scale', type=float, default=1.0, help='Times the size of the real inputs')
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-c', '--compress', choices=lib.COMPRESSIONS, help='Write the inputs compressed')
+    parser.add_argument('--run', action='store_true', help='Solve the generated inputs, timing the stages')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='Seconds per stage after which a day is given up when solving. 0 for no limit')
+    args = parser.parse_args(argv)
+
+    days = sorted(GENERATORS) if args.all else args.days
+    if not days:
+        parser.error('Days are needed unless generating --all')
+
+    for day in days:
+        time_start = time.perf_counter()
+        f = write(day, args.scale, args.seed, args.compress)
+        print(f'{day}: {f.relative_to(runner.ROOT)} ({f.stat().st_size / 1024:.1f} KiB) in '
+              f'{time.perf_counter() - time_start:.3f} s')
+
+        if args.run:
+            # A day failing or running over its time is reported, and the rest are still solved
+            try:
+                problem = problem_for(runner.load_problem_class(runner.find_day(day)), f)
+                stage_results = solve(problem, args.timeout)
+            except Exception as e:
+                print(f'    {type(e).__name__}: {e}')
+                continue
+
+            for stage_result in stage_results:
+                print(f'    {stage_result.stage:10} {stage_result.elapsed:9.3f} s  {stage_result.result}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,18 @@
 import abc
+import collections
+import contextlib
 import dataclasses
 import enum
-import logging
+import gc
+import os
+import sys
 import time
 import math
 import pathlib
 
-from typing import Any, Generator
+# Only what the module needs at import time is imported up here. The rest (logging, hashlib, pickle, signal, traceback)
+# is imported where used, as every run of a day pays for the imports of lib. See bench.py --startup
+from collections.abc import Iterator
 
 
 @dataclasses.dataclass
@@ -194,10 +200,799 @@ class DirectionDiagonals2D(_BaseEnum2D):
     DR = (+1, -1)
 
 
+PROFILES_DIR = pathlib.Path(__file__).parent / 'profiles'
+
+
+def tracer(logger: 'logging.Logger'):
+    """logger.debug if the logger is enabled for DEBUG, otherwise None. Meant to be fetched once, out of hot loops, so
+    that disabled tracing costs a truthiness check. Arguments are formatted lazily, the logging way:
+
+        trace = lib.tracer(self.logger)
+        for pos in positions:
+            if trace:
+                trace('Processing %s', pos)
+    """
+    import logging  # Already imported by whoever made the logger
+
+    return logger.debug if logger.isEnabledFor(logging.DEBUG) else None
+
+
+class Output:
+    """Where the solvers print their diagnostics, through lib.echo: straight to stdout ('direct'), to a buffer written
+    at once at the end of every stage ('buffered', as days solved on their own do) or nowhere ('quiet', as the runner
+    and the benchmarks do). Drawings costly to build are better skipped when output.enabled is False"""
+
+    MODES = ('direct', 'buffered', 'quiet')
+
+    def __init__(self, mode='direct', animate=False):
+        self.mode = mode
+        self.animate = animate  # Whether the days may draw animations, frame after frame. See GridRenderer.redraw
+        self._buffer = []
+
+    @property
+    def enabled(self):
+        return self.mode != 'quiet'
+
+    @property
+    def animating(self):
+        """Whether to draw animations: asked for, and going straight to a terminal, where the frames are seen"""
+        return self.animate and self.mode == 'direct' and sys.stdout.isatty()
+
+    def echo(self, *args, sep=' ', end='\n'):
+        """print, to wherever the output goes"""
+        if self.mode == 'quiet':
+            return
+        if self.mode == 'buffered':
+            self._buffer.append(sep.join(map(str, args)) + end)
+        else:
+            print(*args, sep=sep, end=end)
+
+    def flush(self):
+        if self._buffer:
+            sys.stdout.write(''.join(self._buffer))
+            self._buffer.clear()
+
+    @contextlib.contextmanager
+    def using(self, mode: str):
+        """Switches to mode, back to the previous one on exit. Whatever was buffered is written on both"""
+        if mode not in self.MODES:
+            raise ValueError(f'Unknown output mode {mode}')
+
+        previous_mode = self.mode
+        self.flush()
+        self.mode = mode
+        try:
+            yield self
+        finally:
+            self.flush()
+            self.mode = previous_mode
+
+
+# Where the solvers print to. See Output
+output = Output()
+echo = output.echo
+
+
+def progress(iterable, label: str, total: int = None, interval=1.0, logger: 'logging.Logger' = None):
+    """Yields the items of iterable, reporting how many are done, the items per second and, given the total, the ETA
+    every interval seconds, to tell a slow loop from a hung one. Reports overwrite each other in stderr, or go to
+    logger.
+
+    Runs whose stdout is not a terminal (the runner, benchmarks, pipes) get the iterable back as it is, at no cost"""
+    if not sys.stdout.isatty():
+        return iterable
+
+    if logger:
+        return _progress(iterable, label, total, interval, logger.info, None)
+
+    def report(line):
+        sys.stderr.write(f'\r{line}\x1b[K')
+        sys.stderr.flush()
+
+    return _progress(iterable, label, total, interval, report, lambda: sys.stderr.write('\n'))
+
+
+def _progress_line(label: str, n_done: int, total: int | None, elapsed: float) -> str:
+    rate = n_done / elapsed if elapsed else 0.0
+    if not total:
+        return f'{label}: {n_done} in {elapsed:.0f} s, {rate:.3g}/s'
+
+    eta = f'{(total - n_done) / rate:.0f} s' if rate else '?'
+    return f'{label}: {n_done}/{total} ({100 * n_done / total:.1f}%) in {elapsed:.0f} s, {rate:.3g}/s. ETA {eta}'
+
+
+def _progress(iterable, label, total, interval, report, finish):
+    time_start = time_reported = time.perf_counter()
+    n_done = 0
+    next_check = 1
+    reported = False
+
+    try:
+        for item in iterable:
+            yield item
+
+            n_done += 1
+            if n_done < next_check:
+                continue
+
+            # The clock is only read around 10 times per interval, however fast the items go
+            now = time.perf_counter()
+            next_check = n_done + max(1, int(n_done / max(now - time_start, 1e-9) * interval / 10))
+
+            if now - time_reported >= interval:
+                report(_progress_line(label, n_done, total, now - time_start))
+                time_reported = now
+                reported = True
+    finally:
+        if reported:
+            report(_progress_line(label, n_done, total, time.perf_counter() - time_start))
+            if finish:
+                finish()
+
+
+# How parallel_map runs, unless told otherwise: AOC_PARALLEL is one of PARALLEL_BACKENDS, AOC_WORKERS a number
+PARALLEL_BACKENDS = ('serial', 'thread', 'process')
+
+
+def free_threaded() -> bool:
+    """Whether the interpreter runs Python code in several threads at once, i.e. is a free-threaded build with the GIL
+    disabled"""
+    return not getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+# What the forked workers of parallel_map run, inherited instead of pickled
+_parallel_job = None
+
+
+def _run_parallel_chunk(chunk: range) -> tuple[list, tuple | None]:
+    """The results of the chunk, and what it reported to metrics if collecting, as the worker's copy is thrown away"""
+    func, items = _parallel_job
+    if not metrics.enabled:
+        return [func(items[i]) for i in chunk], None
+
+    metrics.reset()  # Inherited from the parent, which already has it
+    return [func(items[i]) for i in chunk], metrics.state()
+
+
+def parallel_map(func, items, workers: int = None, backend: str = None) -> list:
+    """[func(item) for item in items], spread over workers (all the CPUs by default). On free-threaded interpreters
+    the workers are threads. Otherwise they are forked processes, which inherit func and the items, hence only the
+    results, which must be picklable, are sent back, along with what they reported to metrics. Too few items, or a
+    single worker, run serially"""
+    items = list(items)
+    backend = backend or os.environ.get('AOC_PARALLEL') or ('thread' if free_threaded() else 'process')
+    workers = min(workers or int(os.environ.get('AOC_WORKERS', 0)) or os.cpu_count() or 1, len(items))
+
+    if backend not in PARALLEL_BACKENDS:
+        raise ValueError(f'Unknown parallel backend {backend}')
+
+    if backend == 'serial' or workers <= 1:
+        return [func(item) for item in items]
+
+    import concurrent.futures
+
+    if backend == 'thread':
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+
+    import multiprocessing
+
+    global _parallel_job
+    _parallel_job = (func, items)
+
+    # A few chunks per worker, to balance uneven items without a round trip per item
+    n_chunks = min(len(items), 4 * workers)
+    chunks = [range(n, len(items), n_chunks) for n in range(n_chunks)]
+
+    sys.stdout.flush()  # Otherwise the workers would print whatever is buffered again
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                      mp_context=multiprocessing.get_context('fork'))
+    try:
+        chunk_results = list(executor.map(_run_parallel_chunk, chunks))
+    except BaseException:
+        # A failed chunk, or a StageTimeout: the chunks left are dropped, instead of waited for, with their workers
+        for process in list(executor._processes.values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    else:
+        executor.shutdown()
+    finally:
+        _parallel_job = None
+
+    results = [None] * len(items)
+    for chunk, (chunk_result, _) in zip(chunks, chunk_results):
+        for i, result in zip(chunk, chunk_result):
+            results[i] = result
+
+    # In the order of their last items, so that gauges end up with the last value they would have serially
+    for _, (_, chunk_metrics) in sorted(zip(chunks, chunk_results), key=lambda pair: pair[0][-1]):
+        if chunk_metrics is not None:
+            metrics.merge(chunk_metrics)
+
+    return results
+
+
+INPUT_BUFFER_SIZE = 1 << 16
+
+# Inputs may be compressed, as DD.txt.gz and so on, and are decompressed as they are read. Suffix: module
+COMPRESSIONS = {'.gz': 'gzip', '.xz': 'lzma', '.bz2': 'bz2'}
+
+
+def resolve_input(f: pathlib.Path) -> pathlib.Path:
+    """f, or a compressed version of it if only that one exists"""
+    if f.exists():
+        return f
+
+    for suffix in COMPRESSIONS:
+        if (compressed_f := f.with_name(f.name + suffix)).exists():
+            return compressed_f
+
+    return f
+
+
+def open_input(f: pathlib.Path, mode='r', buffer_size=INPUT_BUFFER_SIZE):
+    """open, decompressing incrementally the compressed inputs. mode is 'r' or 'rb'"""
+    if module_name := COMPRESSIONS.get(f.suffix):
+        import importlib
+
+        return importlib.import_module(module_name).open(f, 'rb' if 'b' in mode else 'rt')
+
+    return open(f, mode, buffering=buffer_size)
+
+
+def iter_lines(f: pathlib.Path, buffer_size=INPUT_BUFFER_SIZE) -> Iterator[str]:
+    """Lines of a file without their line break, read through a buffer of bounded size"""
+    with open_input(f, buffer_size=buffer_size) as f_in:
+        for line in f_in:
+            yield line.rstrip('\n')
+
+
+def iter_blocks(f: pathlib.Path, buffer_size=INPUT_BUFFER_SIZE) -> Iterator[list[str]]:
+    """Groups of lines separated by blank lines, as in multi-section inputs. Only a block is kept in memory"""
+    block = []
+    for line in iter_lines(f, buffer_size):
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+
+    if block:
+        yield block
+
+
+@dataclasses.dataclass
+class StageResult:
+    """Outcome of running one stage (load_data, precompute, solve1, solve2) of an AOCProblem"""
+    stage: str
+    elapsed: float
+    result: object = None
+    cpu: float = 0.0
+    cached: bool = False
+    reports: dict = dataclasses.field(default_factory=dict)
+
+
+def _probe_name(probe) -> str:
+    """memory_probe -> 'memory'. Probes may come wrapped in a functools.partial"""
+    return getattr(probe, 'func', probe).__name__.removesuffix('_probe')
+
+
+def _object_counts() -> collections.Counter:
+    return collections.Counter(type(o).__qualname__ for o in gc.get_objects())
+
+
+# (pause, resume) of the profilers of the probes running, paused by the other probes for their own work
+_running_profilers = []
+
+
+@contextlib.contextmanager
+def profilers_paused():
+    """Out of the profiles of the stage, for the costly work of probes, like counting every object"""
+    for pause, _ in _running_profilers:
+        pause()
+    try:
+        yield
+    finally:
+        for _, resume in _running_profilers:
+            resume()
+
+
+@contextlib.contextmanager
+def _profiled_by(profiler, pause, resume):
+    _running_profilers.append((pause, resume))
+    try:
+        yield profiler
+    finally:
+        _running_profilers.remove((pause, resume))
+
+
+@contextlib.contextmanager
+def memory_probe(problem: 'AOCProblem', stage: str, n_top=10):
+    """Peak traced memory, top allocation sites, and gc-tracked objects by type before and after the stage.
+
+    Meant to be the innermost probe, not to trace what the others allocate. Its own work is kept out of the profilers"""
+    import tracemalloc
+
+    report = {}
+    with profilers_paused():
+        counts_before = _object_counts()
+
+    tracemalloc.start()
+    try:
+        yield report
+    finally:
+        with profilers_paused():
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+            snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                               tracemalloc.Filter(False, contextlib.__file__)))
+            report['peak'] = peak
+            report['retained'] = current
+            report['top'] = [(f'{s.traceback[0].filename}:{s.traceback[0].lineno}', s.size, s.count)
+                             for s in snapshot.statistics('lineno')[:n_top]]
+            del snapshot
+
+            counts_after = _object_counts()
+            counts_after[type(counts_before).__qualname__] -= 1  # Not to count our own
+
+            report['objects'] = {name: (counts_before[name], counts_after[name])
+                                 for name in counts_before.keys() | counts_after.keys()
+                                 if counts_before[name] != counts_after[name]}
+
+
+def _frame_label(filename: str, lineno: int, name: str) -> str:
+    if filename == '~':  # Builtins
+        return name
+    return f'{name} ({pathlib.Path(filename).name}:{lineno})'.replace(';', ',')
+
+
+def collapsed_stacks(stats: dict, min_us=1) -> collections.Counter:
+    """Stacks in the collapsed format of flamegraph tools ('a;b;c' -> µs), from the pstats stats dict.
+
+    cProfile only knows caller -> callee edges, so the self time of a function is split among the paths leading to it
+    in proportion to the time spent through each edge. Recursive calls are not followed"""
+    callees = collections.defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, caller_stats in callers.items():
+            callees[caller][func] = caller_stats[3]
+
+    stacks = collections.Counter()
+
+    def visit(func, path, labels, share):
+        _, _, tottime, _, _ = stats[func]
+        labels = labels + (_frame_label(*func),)
+
+        if (self_us := round(tottime * share * 1e6)) > 0:
+            stacks[';'.join(labels)] += self_us
+
+        for callee, edge_cumtime in callees[func].items():
+            callee_cumtime = stats[callee][3]
+            if callee in path or callee_cumtime <= 0 or edge_cumtime * share * 1e6 < min_us:
+                continue
+            visit(callee, path | {callee}, labels, share * edge_cumtime / callee_cumtime)
+
+    for root in stats:
+        if not any(caller in stats for caller in stats[root][4]):
+            visit(root, {root}, (), 1.0)
+
+    return stacks
+
+
+@contextlib.contextmanager
+def profile_probe(problem: 'AOCProblem', stage: str, out_dir: pathlib.Path = None, n_top=10):
+    """cProfile of the stage, dumped as YYYY/DD.stage.pstats and as YYYY/DD.stage.collapsed in out_dir"""
+    import cProfile
+    import pstats
+
+    out_dir = pathlib.Path(out_dir or PROFILES_DIR) / f'{problem.year}'
+    report = {}
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        with _profiled_by(profiler, profiler.disable, profiler.enable):
+            yield report
+    finally:
+        profiler.disable()
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        pstats_f = out_dir / f'{problem.day:02d}.{stage}.pstats'
+        collapsed_f = out_dir / f'{problem.day:02d}.{stage}.collapsed'
+
+        profiler.dump_stats(pstats_f)
+        stats = pstats.Stats(profiler).stats
+
+        with collapsed_f.open('w') as f_out:
+            for stack, us in sorted(collapsed_stacks(stats).items()):
+                f_out.write(f'{stack} {us}\n')
+
+        by_tottime = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+        report['pstats'] = str(pstats_f)
+        report['collapsed'] = str(collapsed_f)
+        report['top'] = [(_frame_label(*func), nc, tt, ct) for func, (_, nc, tt, ct, _) in by_tottime[:n_top]]
+
+
+class SamplingProfiler:
+    """Samples the Python stack on SIGPROF, i.e. every 1/hz seconds of CPU time used by the process.
+
+    The handler only walks the frames and counts code objects, hence the overhead is negligible at the default rate.
+    It can only run in the main thread"""
+
+    def __init__(self, hz=97):  # Not round, not to sample in lockstep with periodic work
+        self.interval = 1 / hz
+        self.stacks = collections.Counter()
+        self._previous_handler = None
+
+    def _sample(self, _signum, frame):
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+
+        self.stacks[tuple(stack)] += 1
+
+    def start(self):
+        import signal
+
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        import signal
+
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def n_samples(self):
+        return sum(self.stacks.values())
+
+    def top(self, n=10) -> tuple[list, list]:
+        """Most sampled functions, (label, samples), by self and by inclusive samples"""
+        self_samples = collections.Counter()
+        inclusive_samples = collections.Counter()
+
+        for stack, count in self.stacks.items():
+            self_samples[stack[0]] += count
+            for code in set(stack):
+                inclusive_samples[code] += count
+
+        def labelled(counter):
+            return [(_code_label(code), count) for code, count in counter.most_common(n)]
+
+        return labelled(self_samples), labelled(inclusive_samples)
+
+    def collapsed(self) -> collections.Counter:
+        return collections.Counter({';'.join(_code_label(code) for code in reversed(stack)): count
+                                    for stack, count in self.stacks.items()})
+
+
+def _code_label(code) -> str:
+    return _frame_label(code.co_filename, code.co_firstlineno, code.co_name)
+
+
+@contextlib.contextmanager
+def sampling_probe(problem: 'AOCProblem', stage: str, hz=97, n_top=10):
+    """Statistical profile of the stage. Cheap enough to leave on, unlike profile_probe"""
+    report = {}
+
+    profiler = SamplingProfiler(hz)
+    profiler.start()
+    try:
+        with _profiled_by(profiler, profiler.stop, profiler.start):
+            yield report
+    finally:
+        profiler.stop()
+
+        report['samples'] = profiler.n_samples
+        report['interval'] = profiler.interval
+        report['top_self'], report['top_inclusive'] = profiler.top(n_top)
+
+
+# How gc_probe runs the cyclic garbage collector during a stage. Thresholds apply to all of them
+GC_MODES = ('default', 'disable', 'freeze')
+
+
+@contextlib.contextmanager
+def gc_probe(problem: 'AOCProblem', stage: str, mode='default', thresholds: tuple = None):
+    """Collections of the cyclic garbage collector during the stage, per generation, and the time they took. The
+    collector can be disabled for the stage, or frozen: the objects that already exist, like the loaded data, are moved
+    out of its reach, so that the collections of the stage only scan new objects. thresholds are those of
+    gc.set_threshold. Everything is restored afterwards"""
+    if mode not in GC_MODES:
+        raise ValueError(f'Unknown GC mode {mode}')
+
+    report = {'mode': mode, 'thresholds': thresholds or gc.get_threshold(), 'collections': [0, 0, 0],
+              'collected': 0, 'time': 0.0}
+    time_start = None
+
+    def callback(phase, info):
+        nonlocal time_start
+        if phase == 'start':
+            time_start = time.perf_counter()
+            return
+
+        report['collections'][info['generation']] += 1
+        report['collected'] += info['collected']
+        if time_start is not None:
+            report['time'] += time.perf_counter() - time_start
+
+    was_enabled = gc.isenabled()
+    previous_thresholds = gc.get_threshold()
+
+    if thresholds:
+        gc.set_threshold(*thresholds)
+    if mode == 'disable':
+        gc.disable()
+    elif mode == 'freeze':
+        gc.freeze()
+    gc.callbacks.append(callback)
+
+    try:
+        yield report
+    finally:
+        gc.callbacks.remove(callback)
+        if mode == 'freeze':
+            gc.unfreeze()
+        if was_enabled:
+            gc.enable()
+        gc.set_threshold(*previous_thresholds)
+
+
+def format_gc_report(report: dict) -> str:
+    collections_str = ', '.join(f'gen{generation} {n}' for generation, n in enumerate(report['collections']))
+    return (f'  GC {report["mode"]}, thresholds {tuple(report["thresholds"])}: {collections_str}. '
+            f'{report["collected"]} objects collected in {report["time"] * 1000:.1f} ms')
+
+
+class StageTimeout(Exception):
+    """A stage ran over the wall-clock limit of limits_probe"""
+
+
+class StageOutOfMemory(MemoryError):
+    """A stage ran over the address-space limit of limits_probe"""
+
+
+@contextlib.contextmanager
+def limits_probe(problem: 'AOCProblem', stage: str, timeout: float | dict = None, max_memory: int = None):
+    """Limits the stage to timeout seconds of wall-clock time (SIGALRM, main thread only), or to those of the stage
+    when timeout is a dict of seconds by stage, and the process to max_memory bytes of address space (RLIMIT_AS,
+    which counts the interpreter itself too). Going over raises StageTimeout or StageOutOfMemory. Loops in C code
+    cannot be interrupted, so runaway stages are better run in a child process that can be killed, as the runner
+    does"""
+    import resource
+    import signal
+
+    if isinstance(timeout, dict):
+        timeout = timeout.get(stage)
+
+    report = {'timeout': timeout, 'max_memory': max_memory}
+
+    def alarm(_signum, _frame):
+        raise StageTimeout(f'{stage} ran over its time limit of {timeout} s')
+
+    previous_handler = signal.signal(signal.SIGALRM, alarm) if timeout else None
+    previous_limits = resource.getrlimit(resource.RLIMIT_AS)
+
+    if max_memory:
+        _, hard = previous_limits
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory if hard == resource.RLIM_INFINITY else
+                                                min(max_memory, hard), hard))
+    if timeout:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        yield report
+    except MemoryError as e:
+        if not max_memory or isinstance(e, StageOutOfMemory):
+            raise
+        raise StageOutOfMemory(f'{stage} ran over the memory limit of {max_memory / 2 ** 20:.0f} MiB') from None
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+        if max_memory:
+            resource.setrlimit(resource.RLIMIT_AS, previous_limits)
+
+
+class Metrics:
+    """Counters, gauges and histograms of what the solvers do (states explored, cache hits, queue depths...), reported
+    per stage by metrics_probe. Calls do nothing unless a probe is collecting, and cost a dict update when one is. In
+    hot loops, fetch the bound methods out of them, like tracer, or count locally and report once"""
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = collections.Counter()
+        self.gauges = {}
+        self.histograms = {}
+
+        # Updates are serialised, as the thread workers of parallel_map share the registry. A real lock only while a
+        # probe is collecting
+        self.lock = contextlib.nullcontext()
+
+    def reset(self):
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+    def count(self, name: str, n=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] += n
+
+    def gauge(self, name: str, value):
+        """The last value, and the peak"""
+        if not self.enabled:
+            return
+        with self.lock:
+            if (current := self.gauges.get(name)) is None:
+                self.gauges[name] = [value, value]
+            else:
+                current[0] = value
+                if value > current[1]:
+                    current[1] = value
+
+    def observe(self, name: str, value):
+        """Summary of a distribution: count, sum, min, max and counts per power of 2 bucket, not the values"""
+        if not self.enabled:
+            return
+        with self.lock:
+            if (histogram := self.histograms.get(name)) is None:
+                histogram = self.histograms[name] = {'count': 0, 'sum': 0, 'min': value, 'max': value,
+                                                     'buckets': collections.Counter()}
+            histogram['count'] += 1
+            histogram['sum'] += value
+            histogram['min'] = min(histogram['min'], value)
+            histogram['max'] = max(histogram['max'], value)
+            histogram['buckets'][2 ** math.frexp(value)[1] if value > 0 else 0] += 1
+
+    def state(self) -> tuple:
+        """What merge takes"""
+        return self.counters, self.gauges, self.histograms
+
+    def merge(self, state: tuple):
+        """Adds the state of another Metrics, like the ones of the parallel_map workers"""
+        counters, gauges, histograms = state
+
+        self.counters.update(counters)
+
+        for name, (last, peak) in gauges.items():
+            if (current := self.gauges.get(name)) is None:
+                self.gauges[name] = [last, peak]
+            else:
+                current[0] = last
+                current[1] = max(current[1], peak)
+
+        for name, other in histograms.items():
+            if (histogram := self.histograms.get(name)) is None:
+                self.histograms[name] = other | {'buckets': collections.Counter(other['buckets'])}
+                continue
+            histogram['count'] += other['count']
+            histogram['sum'] += other['sum']
+            histogram['min'] = min(histogram['min'], other['min'])
+            histogram['max'] = max(histogram['max'], other['max'])
+            histogram['buckets'].update(other['buckets'])
+
+    def snapshot(self) -> dict:
+        return {
+            'counters': dict(self.counters),
+            'gauges': {name: {'last': last, 'peak': peak} for name, (last, peak) in self.gauges.items()},
+            'histograms': {name: histogram | {'buckets': dict(sorted(histogram['buckets'].items()))}
+                           for name, histogram in self.histograms.items()},
+        }
+
+
+# What the solvers report to. See Metrics
+metrics = Metrics()
+
+
+@contextlib.contextmanager
+def metrics_probe(problem: 'AOCProblem', stage: str):
+    """What the stage reported to lib.metrics"""
+    import threading
+
+    report = {}
+
+    metrics.reset()
+    metrics.lock = threading.Lock()
+    metrics.enabled = True
+    try:
+        yield report
+    finally:
+        metrics.enabled = False
+        metrics.lock = contextlib.nullcontext()
+        report.update(metrics.snapshot())
+        metrics.reset()
+
+
+def format_metrics_report(report: dict) -> str:
+    lines = []
+    for name, value in report['counters'].items():
+        lines.append(f'    {name:30} {value:12d}')
+    for name, gauge in report['gauges'].items():
+        lines.append(f'    {name:30} {gauge["last"]:12} (peak {gauge["peak"]})')
+    for name, histogram in report['histograms'].items():
+        mean = histogram['sum'] / histogram['count']
+        lines.append(f'    {name:30} {histogram["count"]:12d} values. Mean {mean:.3g}, min {histogram["min"]}, '
+                     f'max {histogram["max"]}')
+        lines.append('      ' + ' '.join(f'{f"<{bound}" if bound else "<=0"}: {count}'
+                                         for bound, count in histogram['buckets'].items()))
+
+    return '\n'.join(['  Metrics:'] + lines)
+
+
+def format_sampling_report(report: dict) -> str:
+    if not (n_samples := report['samples']):
+        return f'  No samples (1 every {report["interval"] * 1000:.1f} ms of CPU time)'
+
+    lines = [f'  {n_samples} samples, 1 every {report["interval"] * 1000:.1f} ms of CPU time',
+             f'    {"self":>6} {"%":>6}  {"total":>6} {"%":>6}  function']
+
+    top_inclusive = dict(report['top_inclusive'])
+    for label, count in report['top_self']:
+        total = top_inclusive.get(label)
+        total_str = f'{total:6d} {100 * total / n_samples:6.1f}' if total else f'{"":6} {"":6}'
+        lines.append(f'    {count:6d} {100 * count / n_samples:6.1f}  {total_str}  {label}')
+
+    return '\n'.join(lines)
+
+
+def format_profile_report(report: dict) -> str:
+    lines = [f'  Profile: {report["pstats"]}. Collapsed stacks: {report["collapsed"]}',
+             f'    {"ncalls":>9} {"tottime":>9} {"cumtime":>9}  function']
+    for label, ncalls, tottime, cumtime in report['top']:
+        lines.append(f'    {ncalls:9d} {tottime:9.3f} {cumtime:9.3f}  {label}')
+
+    return '\n'.join(lines)
+
+
+def format_memory_report(report: dict, n_objects=10) -> str:
+    lines = [f'  Peak traced memory: {report["peak"] / 1024:.1f} KiB. Retained: {report["retained"] / 1024:.1f} KiB']
+
+    lines.append('  Top allocation sites:')
+    for site, size, count in report['top']:
+        lines.append(f'    {size / 1024:10.1f} KiB {count:9d} blocks  {site}')
+
+    lines.append('  Objects by type (before -> after):')
+    by_delta = sorted(report['objects'].items(), key=lambda item: abs(item[1][1] - item[1][0]), reverse=True)
+    for name, (before, after) in by_delta[:n_objects]:
+        lines.append(f'    {after - before:+10d}  {name}: {before} -> {after}')
+
+    return '\n'.join(lines)
+
+
 class AOCProblem(abc.ABC):
 
+    STAGES = ('load_data', 'precompute', 'solve1', 'solve2')
+
+    # Stages whose products, i.e. the state of the instance after them, can be cached. See run_stage
+    CACHED_STAGES = ('load_data', 'precompute')
+
+    # Stage that replaces all the others in days that implement it. See solve_both
+    FUSED_STAGE = 'solve_both'
+
+    # Exponent of the power law the time of a stage is expected to grow with, against the size of the input. Stages not
+    # listed are expected to be linear. See bench.py --complexity
+    EXPECTED_EXPONENTS = {}
+
+    CACHE_DIR = pathlib.Path(__file__).parent / '.cache'
+
+    # Attributes that are not part of the state produced by load_data
+    _CACHE_EXCLUDED = ('_logger', 'use_cache', 'verbose')
+
     def __init__(self, dunder_file_child, test=False, verbose=False):
         caller_f = pathlib.Path(dunder_file_child)
+        self._source_f = caller_f
 
         self.day = int(caller_f.stem)
         self.year = int(caller_f.parent.name)
@@ -206,50 +1001,434 @@ class AOCProblem(abc.ABC):
         self.input_f = input_f_stem.with_suffix('.txt')
         self.input_f_test = input_f_stem.with_suffix('.test.txt')
         self.test = test
+        self.use_cache = bool(os.environ.get('AOC_CACHE'))
+
+        self.verbose = verbose
+        self._logger = None
+
+    @property
+    def logger(self) -> 'logging.Logger':
+        """Set up on first use. Most runs never log, and logging is one of the costliest imports"""
+        if self._logger is None:
+            import logging
+
+            logging.basicConfig(level=logging.DEBUG if self.verbose else logging.INFO,
+                                format='%(asctime)s %(levelname)s %(message)s', datefmt='%H:%M:%S')
+            self._logger = logging.getLogger(f'advent-of-code_{self.year}-{self.day:02d}')
+
+        return self._logger
 
-        if not (f_applicable := self.input_f_test if test else self.input_f).exists():
-            if not (parent := f_applicable.parent).exists():
-                parent.mkdir(parents=True)
-                print('Just created the input folder:', parent.as_uri())
+    @property
+    def trace(self):
+        """See lib.tracer. Fetch it out of the loops. None unless verbose, without setting up the logger"""
+        return tracer(self.logger) if self.verbose else None
+
+    @property
+    def input_path(self) -> pathlib.Path:
+        """The input file, or a compressed version of it. See resolve_input"""
+        return resolve_input(self.input_f_test if self.test else self.input_f)
+
+    def _ensure_input(self):
+        if (f_applicable := self.input_path).exists():
+            return
 
-            f_applicable.touch()
-            print(f'Just created {f_applicable.as_uri()}. Paste your input there!')
-            raise SystemExit(1)
+        if not (parent := f_applicable.parent).exists():
+            parent.mkdir(parents=True)
+            print('Just created the input folder:', parent.as_uri())
 
-        logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO,
-                            format='%(asctime)s %(levelname)s %(message)s', datefmt='%H:%M:%S')
-        self.logger = logging.getLogger(f'advent-of-code_{self.year}-{self.day:02d}')
+        f_applicable.touch()
+        print(f'Just created {f_applicable.as_uri()}. Paste your input there!')
+        raise SystemExit(1)
+
+    def iter_lines(self, f: pathlib.Path = None) -> Iterator[str]:
+        """Lines of the input (or f) without their line break. See lib.iter_lines"""
+        return iter_lines(f or self.input_path)
+
+    def iter_blocks(self, f: pathlib.Path = None) -> Iterator[list[str]]:
+        """Blank-line-separated blocks of lines of the input (or f). See lib.iter_blocks"""
+        return iter_blocks(f or self.input_path)
 
     def load_data(self, f: pathlib.Path):
         raise NotImplementedError
 
+    def precompute(self):
+        """Work shared by both parts, done once after load_data and timed apart. Its products are left on the instance,
+        where both parts find them, even when they run in forked processes"""
+        return None
+
     def solve1(self):
         raise NotImplementedError
 
     def solve2(self):
         raise NotImplementedError
 
-    def __call__(self):
-        test_str = ' (test)' if self.test else ''
+    @classmethod
+    def prepare_batch(cls, input_fs: list[pathlib.Path]):
+        """Optional. Work shared by all the inputs of a batch (see solve_batch), done once before solving any of them,
+        e.g. filling lookup tables the instances use. Products are kept by the class, replacing those of the previous
+        batch, as the classes outlive the batches in server.py"""
+        return None
 
-        f = self.input_f_test if self.test else self.input_f
+    @classmethod
+    def solve_batch(cls, input_fs, probes=(), fused=True) -> tuple[StageResult, dict]:
+        """Solves many inputs in this process, with an instance per input whose stages run like in run. Compiled
+        regexes, lookup tables and caches at class or module level stay warm from an input to the next.
 
-        print(f'Solving AoC day {self.day}{test_str}. See https://adventofcode.com/{self.year}/day/{self.day}.')
+        Returns the StageResult of prepare_batch, and the StageResults of every input (or the exception it raised, not
+        to stop the batch) by input file"""
+        input_fs = [pathlib.Path(f) for f in input_fs]
 
+        cpu_start = time.process_time()
         time_start = time.perf_counter()
-        self.load_data(f)
-        time_end = time.perf_counter()
-        print(f'Loaded data. Time elapsed: {time_end - time_start:.3f} s')
+        cls.prepare_batch(input_fs)
+        prepare_result = StageResult('prepare_batch', time.perf_counter() - time_start,
+                                     cpu=time.process_time() - cpu_start)
 
-        time_start = time.perf_counter()
-        result = self.solve1()
-        time_end = time.perf_counter()
-        print(f'First star result{test_str}: {result}. Time elapsed: {time_end - time_start:.3f} s')
+        results = {}
+        for input_f in input_fs:
+            try:
+                problem = cls()
+                problem.input_f = input_f
+                results[input_f] = problem.run(probes, fused=fused)
+            except Exception as e:
+                results[input_f] = e
 
-        time_start = time.perf_counter()
-        result = self.solve2()
-        time_end = time.perf_counter()
-        print(f'Second star result{test_str}: {result}. Time elapsed: {time_end - time_start:.3f} s', )
+        return prepare_result, results
+
+    def solve_both(self, f: pathlib.Path) -> tuple:
+        """Optional. Both answers from a single streaming read of the input, skipping load_data and precompute, hence
+        fit for inputs too large to keep in memory. Days implementing it are solved this way unless told otherwise"""
+        raise NotImplementedError
+
+    @property
+    def fused(self) -> bool:
+        """Whether the day implements solve_both"""
+        return self._overrides(self.FUSED_STAGE)
+
+    def _overrides(self, stage: str) -> bool:
+        return getattr(type(self), stage) is not getattr(AOCProblem, stage)
+
+    def _cache_f(self, f: pathlib.Path, stage: str) -> pathlib.Path:
+        """The key covers the input, the day source, lib and the module name (pickles refer to classes by module).
+
+        The name of the input is part of the file name too, so that the entries of different inputs of a day (test,
+        real, batch or generated ones) don't evict each other. See _save_cached"""
+        import hashlib
+        import re
+
+        module = type(self).__module__
+        input_name = re.sub(r'[^\w.-]', '_', f.name)
+
+        digest = hashlib.sha256(module.encode())
+        for source in (f, self._source_f, pathlib.Path(__file__)):
+            with source.open('rb') as f_in:  # In chunks, as inputs may be too large to read at once
+                digest.update(hashlib.file_digest(f_in, 'sha256').digest())
+
+        return (self.CACHE_DIR / f'{self.year}'
+                / f'{self.day:02d}.{module}.{input_name}.{stage}.{digest.hexdigest()[:32]}.pickle')
+
+    def _load_cached(self, cache_f: pathlib.Path) -> bool:
+        import pickle
+
+        try:
+            with cache_f.open('rb') as f_in:
+                state = pickle.load(f_in)
+        except FileNotFoundError:
+            return False
+        except (pickle.UnpicklingError, AttributeError, EOFError, ImportError) as e:
+            self.logger.warning('Ignoring unreadable cache %s: %s', cache_f, e)
+            return False
+
+        self.__dict__.update(state)
+        return True
+
+    def _save_cached(self, cache_f: pathlib.Path):
+        """Best effort. A state that cannot be pickled (locks, queues...) is just not cached"""
+        import pickle
+
+        state = {k: v for k, v in self.__dict__.items() if k not in self._CACHE_EXCLUDED}
+
+        cache_f.parent.mkdir(parents=True, exist_ok=True)
+        stem_without_digest = cache_f.name.rsplit('.', 2)[0]
+        for stale_f in cache_f.parent.glob(f'{stem_without_digest}.*.pickle'):
+            stale_f.unlink(missing_ok=True)
+
+        # Written aside and renamed, as parallel runs may be writing the same entry
+        tmp_f = cache_f.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with tmp_f.open('wb') as f_out:
+                pickle.dump(state, f_out, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_f, cache_f)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            self.logger.debug('Not caching %s: %s', cache_f.name, e)
+        except RecursionError:
+            # Long linked structures, like chains of nodes, nest deeper than pickle can go
+            self.logger.warning('Not caching %s: its state is nested too deep to pickle', cache_f.name)
+        finally:
+            tmp_f.unlink(missing_ok=True)
+
+    def run_stage(self, stage: str, probes=()) -> StageResult:
+        """Runs a single stage, timing it.
+
+        Probes are context manager factories called with (problem, stage), like memory_probe, that yield a dict to
+        fill with their findings. It ends up in the StageResult reports under the probe name.
+
+        When use_cache is set, the state left by each of the CACHED_STAGES the day defines is snapshotted to disk and
+        restored on later runs with the same input and sources. Only instance attributes are snapshotted. Hashing the
+        key is timed as part of the stage, so that times from cache are not flattered."""
+        if stage not in self.STAGES and stage != self.FUSED_STAGE:
+            raise ValueError(f'Unknown stage {stage}')
+
+        args = (self.input_path,) if stage in ('load_data', self.FUSED_STAGE) else ()
+        use_cache = self.use_cache and stage in self.CACHED_STAGES and self._overrides(stage)
+        cache_f = None
+
+        with contextlib.ExitStack() as probe_stack:
+            reports = {_probe_name(probe): probe_stack.enter_context(probe(self, stage)) for probe in probes}
+
+            cpu_start = time.process_time()
+            time_start = time.perf_counter()
+
+            try:
+                if use_cache:
+                    cache_f = self._cache_f(self.input_path, stage)
+
+                if cached := bool(cache_f and self._load_cached(cache_f)):
+                    result = None
+                else:
+                    result = getattr(self, stage)(*args)
+
+                time_end = time.perf_counter()
+                cpu_end = time.process_time()
+            finally:
+                output.flush()  # Out of the timing
+
+        if cache_f and not cached:
+            self._save_cached(cache_f)
+
+        return StageResult(stage, time_end - time_start, result, cpu_end - cpu_start, cached, reports)
+
+    def run(self, probes=(), fork_parts=False, fused=True) -> list[StageResult]:
+        """Runs all the stages in order, without printing anything. See run_parts_forked for fork_parts.
+
+        Days implementing solve_both only run that stage, unless fused is False"""
+        if fused and self.fused:
+            return [self.run_stage(self.FUSED_STAGE, probes)]
+
+        stage_results = [self.run_stage(stage, probes) for stage in ('load_data', 'precompute')]
+
+        if fork_parts:
+            stage_results.extend(self.run_parts_forked(probes))
+        else:
+            stage_results.extend(self.run_stage(stage, probes) for stage in ('solve1', 'solve2'))
+
+        return stage_results
+
+    def run_parts_forked(self, probes=()) -> list[StageResult]:
+        """Runs solve1 and solve2 at the same time, each in a forked copy of the loaded instance. The memory is shared
+        copy-on-write, and neither part sees the changes of the other one, so work both need goes in precompute. Results
+        need to be picklable"""
+        import pickle
+        import traceback
+
+        sys.stdout.flush()  # Otherwise the children would print whatever is buffered again
+
+        children = []
+        for stage in ('solve1', 'solve2'):
+            read_fd, write_fd = os.pipe()
+
+            if not (pid := os.fork()):
+                os.close(read_fd)
+                try:
+                    try:
+                        payload = self.run_stage(stage, probes)
+                    except (StageTimeout, StageOutOfMemory) as e:
+                        payload = e
+                    except BaseException:
+                        payload = traceback.format_exc()  # Exceptions may not be picklable
+
+                    with os.fdopen(write_fd, 'wb') as pipe:
+                        pickle.dump(payload, pipe, protocol=pickle.HIGHEST_PROTOCOL)
+                finally:
+                    sys.stdout.flush()
+                    os._exit(0)
+
+            os.close(write_fd)
+            children.append((stage, pid, read_fd))
+
+        payloads = []
+        for stage, pid, read_fd in children:  # Every child is waited for before raising, not to leave any behind
+            with os.fdopen(read_fd, 'rb') as pipe:
+                try:
+                    payload = pickle.load(pipe)
+                except EOFError:
+                    payload = None
+            _, status = os.waitpid(pid, 0)
+
+            if payload is None:
+                payload = f'The process died without a result. Exit code {os.waitstatus_to_exitcode(status)}'
+            payloads.append((stage, payload))
+
+        for stage, payload in payloads:
+            if isinstance(payload, Exception):
+                raise payload
+            if isinstance(payload, str):
+                raise RuntimeError(f'{stage} failed in its own process:\n{payload}')
+
+        return [payload for _, payload in payloads]
+
+    def __call__(self, memory=None, profile=None, sample=None, fork_parts=None, fused=None, collect_metrics=None,
+                 animate=None):
+        """Solves the problem printing the results. Memory reports, cProfile dumps, sampled profiles and the values
+        reported to lib.metrics are given with memory=True or --memory, profile=True or --profile, sample=True or
+        --sample, and collect_metrics=True or --metrics. Both parts are solved at the same time with fork_parts=True or
+        --fork-parts. Days implementing solve_both are solved with it, unless fused=False or --no-fuse. The days with
+        animations draw them with animate=True or --animate, which writes the output as it comes instead of by stage"""
+        self._ensure_input()
+
+        if memory is None:
+            memory = '--memory' in sys.argv[1:]
+        if profile is None:
+            profile = '--profile' in sys.argv[1:]
+        if sample is None:
+            sample = '--sample' in sys.argv[1:]
+        if fork_parts is None:
+            fork_parts = '--fork-parts' in sys.argv[1:]
+        if fused is None:
+            fused = '--no-fuse' not in sys.argv[1:]
+        if collect_metrics is None:
+            collect_metrics = '--metrics' in sys.argv[1:]
+        if animate is None:
+            animate = '--animate' in sys.argv[1:]
+
+        # The memory one the innermost, not to trace what the others allocate. See memory_probe
+        probes = ((profile_probe,) * profile + (sampling_probe,) * sample + (metrics_probe,) * collect_metrics +
+                  (memory_probe,) * memory)
+
+        test_str = ' (test)' if self.test else ''
+
+        print(f'Solving AoC day {self.day}{test_str}. See https://adventofcode.com/{self.year}/day/{self.day}.')
+
+        previous_animate, output.animate = output.animate, animate
+        try:
+            with output.using('direct' if animate else 'buffered'):
+                self._solve_printing(probes, fork_parts, fused)
+        finally:
+            output.animate = previous_animate
+
+    def _solve_printing(self, probes, fork_parts, fused):
+        test_str = ' (test)' if self.test else ''
+
+        if fused and self.fused:
+            stage_result = self.run_stage(self.FUSED_STAGE, probes)
+            for star, result in zip(('First', 'Second'), stage_result.result):
+                print(f'{star} star result{test_str}: {result}')
+            print(f'Both stars solved in a single read. Time elapsed: {stage_result.elapsed:.3f} s')
+            self._print_reports(stage_result)
+            return
+
+        stage_result = self.run_stage('load_data', probes)
+        cached_str = ' from cache' if stage_result.cached else ''
+        print(f'Loaded data{cached_str}. Time elapsed: {stage_result.elapsed:.3f} s')
+        self._print_reports(stage_result)
+
+        stage_result = self.run_stage('precompute', probes)
+        if self._overrides('precompute'):
+            cached_str = ' from cache' if stage_result.cached else ''
+            print(f'Precomputed{cached_str}. Time elapsed: {stage_result.elapsed:.3f} s')
+            self._print_reports(stage_result)
+
+        if fork_parts:
+            time_start = time.perf_counter()
+            part_results = self.run_parts_forked(probes)
+            time_end = time.perf_counter()
+        else:
+            part_results = (self.run_stage(stage, probes) for stage in ('solve1', 'solve2'))
+
+        for star, stage_result in zip(('First', 'Second'), part_results):
+            print(f'{star} star result{test_str}: {stage_result.result}. Time elapsed: {stage_result.elapsed:.3f} s')
+            self._print_reports(stage_result)
+
+        if fork_parts:
+            print(f'Both parts solved in {time_end - time_start:.3f} s')
+
+    @staticmethod
+    def _print_reports(stage_result: StageResult):
+        if memory_report := stage_result.reports.get('memory'):
+            print(format_memory_report(memory_report))
+        if profile_report := stage_result.reports.get('profile'):
+            print(format_profile_report(profile_report))
+        if sampling_report := stage_result.reports.get('sampling'):
+            print(format_sampling_report(sampling_report))
+        if (metrics_report := stage_result.reports.get('metrics')) and any(metrics_report.values()):
+            print(format_metrics_report(metrics_report))
+        if gc_report := stage_result.reports.get('gc'):
+            print(format_gc_report(gc_report))
+
+
+class GridRenderer:
+    """Frames of grids of characters with colour overlays, built in a single pass over the cells. Overlays map colour
+    names to sets of positions ((y, x) tuples or Position2D) or to masks (rows of booleans). The first overlay wins
+    where they overlap.
+
+    For animations, redraw gives only what changed since the previous frame, as terminal cursor moves and writes"""
+
+    COLOURS = {name: f'\x1b[{code}m' for code, name in enumerate(
+        ('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white'), start=30)}
+    RESET = '\x1b[0m'
+    CLEAR = '\x1b[2J\x1b[H'
+
+    def __init__(self, overlays: dict = None):
+        self.overlays = overlays or {}
+        self._previous = None
+
+    def _cells(self, rows, overlays: dict = None) -> list[list[str]]:
+        cells = [list(row) if isinstance(row, str) else [str(c) for c in row] for row in rows]
+
+        colours = {}
+        for name, overlay in (overlays or self.overlays).items():
+            colour = self.COLOURS[name]
+
+            if isinstance(overlay, (set, frozenset)):
+                positions = (pos.as_tuple() if isinstance(pos, _Base2D) else pos for pos in overlay)
+            else:
+                positions = ((y, x) for y, mask_row in enumerate(overlay)
+                             for x, masked in enumerate(mask_row) if masked)
+
+            for pos in positions:
+                colours.setdefault(pos, colour)
+
+        for (y, x), colour in colours.items():
+            if 0 <= y < len(cells) and 0 <= x < len(row := cells[y]):
+                row[x] = f'{colour}{row[x]}{self.RESET}'
+
+        return cells
+
+    def frame(self, rows, overlays: dict = None) -> str:
+        """The whole grid. rows are strings or sequences of cells, which are drawn as str(cell)"""
+        return '\n'.join(''.join(row) for row in self._cells(rows, overlays))
+
+    def redraw(self, rows, overlays: dict = None) -> str:
+        """What turns the previous frame on the terminal into this one. The first one, or one of a different height,
+        clears the screen and draws the whole grid"""
+        cells = self._cells(rows, overlays)
+        previous, self._previous = self._previous, cells
+
+        if previous is None or len(previous) != len(cells):
+            return self.CLEAR + '\n'.join(''.join(row) for row in cells) + '\n'
+
+        changes = []
+        for y, (row, previous_row) in enumerate(zip(cells, previous)):
+            if row == previous_row:
+                continue
+            if len(row) != len(previous_row):
+                changes.append(f'\x1b[{y + 1};1H\x1b[2K{"".join(row)}')
+                continue
+            changes.extend(f'\x1b[{y + 1};{x + 1}H{cell}'
+                           for x, (cell, previous_cell) in enumerate(zip(row, previous_row)) if cell != previous_cell)
+
+        changes.append(f'\x1b[{len(cells) + 1};1H')  # The cursor back under the grid
+        return ''.join(changes)
 
 
 class AOCGrid:
@@ -275,14 +1454,15 @@ class AOCGrid:
                 return splitter
 
     def load_f(self, f):
-        with f.open() as f_in:
-            rows = f_in.readlines()
-        self.load_list(rows)
+        self.rows = [self._parse_row(row) for row in iter_lines(f)]
+
+    def _parse_row(self, row: str) -> list:
+        return [self._types(s) for s in row.strip()]
 
     def load_list(self, rows):
         if isinstance(rows[0], str):
 
-            self.rows = [[self._types(s) for s in row.strip()] for row in rows]
+            self.rows = [self._parse_row(row) for row in rows]
 
         elif isinstance(rows[0], list):
             self.rows = rows.copy()
@@ -303,7 +1483,7 @@ class AOCGrid:
 
         return all_calls
 
-    def iter_with_pos(self, axis: Axis = Axis.ROW, reverse=False) -> Generator[Position2D, Any, Any]:
+    def iter_with_pos(self, axis: Axis = Axis.ROW, reverse=False) -> Iterator[tuple[Position2D, object]]:
         if axis == self.Axis.ROW:
             val_1_name = 'y'
             val_2_name = 'x'
@@ -356,11 +1536,15 @@ class AOCGrid:
     def __str__(self):
         return self._splitter.join([''.join([str(c) for c in row]) for row in self.rows])
 
-    def print(self):
-        print('-' * self.width)
-        print(str(self).replace(self._splitter, '\n'))
-        print('-' * self.width)
-        print()
+    def print(self, overlays: dict = None):
+        """See GridRenderer for the overlays"""
+        if not output.enabled:
+            return
+
+        echo('-' * self.width)
+        echo(GridRenderer(overlays).frame(self.rows))
+        echo('-' * self.width)
+        echo()
 
     def pos_is_oob(self, pos: Position2D) -> bool:
         """ Whether a pos is out of bounds"""
@@ -0,0 +1,138 @@
+""" Checks the answers of every day against the ones recorded in answers.json, for the test and the real inputs, and
+that no stage takes longer than its time budget. Exits with 1 if anything fails.
+
+    python regression.py            # Check all of them
+    python regression.py --record   # Store the current answers as the expected ones
+
+A run without recorded answers fails too, unless --allow-missing is given. Stages are stopped, failing as TIMEOUT,
+when they reach their budget, so that a hanging day cannot hang the suite. Parts not solved yet (None) are not
+recorded. Recorded answers are meant to be checked against the puzzle before committing them.
+"""
+
+import argparse
+import json
+import sys
+
+import runner
+
+ANSWERS_F = runner.ROOT / 'answers.json'
+
+PARTS = ('solve1', 'solve2')
+
+
+def load_answers() -> dict:
+    with ANSWERS_F.open() as f:
+        return json.load(f)
+
+
+def save_answers(answers: dict):
+    with ANSWERS_F.open('w') as f:
+        json.dump(answers, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def input_kind(report: runner.DayReport) -> str:
+    return 'test' if report.test else 'real'
+
+
+def day_name(report: runner.DayReport) -> str:
+    return f'{report.year}/{report.day:02d}'
+
+
+def budgets_for(answers: dict, day: str) -> dict:
+    """Seconds per stage. The ones of the day override the defaults"""
+    return answers['budgets']['default'] | answers['days'].get(day, {}).get('budgets', {})
+
+
+def check(report: runner.DayReport, answers: dict) -> list[str]:
+    """The failures of a day run"""
+    if report.status != 'OK':
+        return [f'{report.status}: {report.error}' if report.error else report.status]
+
+    failures = []
+    day = day_name(report)
+
+    expected = answers['days'].get(day, {}).get(input_kind(report), {})
+    for part in PARTS:
+        if part in expected and report.results.get(part) != expected[part]:
+            failures.append(f'{part} answered {report.results.get(part)!r}, expected {expected[part]!r}')
+
+    for stage, budget in budgets_for(answers, day).items():
+        if (elapsed := report.timings.get(stage, 0)) > budget:
+            failures.append(f'{stage} took {elapsed:.3f} s, over its budget of {budget:.3f} s')
+
+    return failures
+
+
+def record(reports: list[runner.DayReport], answers: dict):
+    for report in reports:
+        if report.status != 'OK':
+            continue
+
+        day_answers = answers['days'].setdefault(day_name(report), {})
+        day_answers[input_kind(report)] = {part: report.results[part] for part in PARTS
+                                           if report.results.get(part) is not None}
+
+
+def by_budgets(day_files: list, answers: dict) -> dict[tuple, list]:
+    """The day files grouped by their stage budgets, as (stage, seconds) pairs, to run each group with them as
+    timeouts"""
+    groups = {}
+    for f in day_files:
+        budgets = budgets_for(answers, f'{f.parent.name}/{f.stem}')
+        groups.setdefault(tuple(sorted(budgets.items())), []).append(f)
+    return groups
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('days', nargs='*', help='Years (2023) or days (2023/05) to check. All of them by default')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--record', action='store_true', help='Store the current answers as the expected ones')
+    parser.add_argument('--allow-missing', action='store_true', help="Don't fail the runs without recorded answers")
+    parser.add_argument('--timeout', type=float,
+                        help='Seconds per stage after which a day fails as TIMEOUT. Its budget by default')
+    parser.add_argument('--no-fuse', action='store_true', help='Check the separate parts of the days with solve_both')
+    args = parser.parse_args(argv)
+
+    answers = load_answers()
+    day_files = runner.discover(args.days)
+
+    reports = []
+    for test in (True, False):
+        for budgets, group in by_budgets(day_files, answers).items():
+            options = runner.RunOptions(test=test, timeout=args.timeout or dict(budgets), fused=not args.no_fuse)
+            reports.extend(runner.run_all(group, jobs=args.jobs, options=options))
+
+    if args.record:
+        record(reports, answers)
+        save_answers(answers)
+        print(f'Recorded the answers of {sum(r.status == "OK" for r in reports)} runs in {ANSWERS_F.name}')
+        return 0
+
+    n_failed = n_unchecked = 0
+
+    for report in sorted(reports, key=lambda r: (r.year, r.day, not r.test)):
+        if report.status == 'NO INPUT':
+            continue
+
+        if failures := check(report, answers):
+            n_failed += 1
+            print(f'FAIL {report.key}')
+            for failure in failures:
+                print(f'       {failure}')
+
+        elif input_kind(report) not in answers['days'].get(day_name(report), {}):
+            n_unchecked += 1
+            print(f'{"??  " if args.allow_missing else "FAIL"} {report.key}: no expected answers recorded')
+
+        else:
+            print(f'ok   {report.key}')
+
+    print(f'{n_failed} failed, {n_unchecked} without expected answers')
+
+    return 1 if n_failed or (n_unchecked and not args.allow_missing) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
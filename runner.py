@@ -0,0 +1,446 @@
+""" Discovers every YYYY/DD.py Problem and runs them across a process pool, printing a single summary table. """
+
+import argparse
+import ast
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import importlib.util
+import json
+import math
+import os
+import pickle
+import select
+import signal
+import sys
+import time
+
+from pathlib import Path
+
+import lib
+
+ROOT = Path(__file__).parent
+
+TIMINGS_F = ROOT / '.runner_timings.json'
+
+# Seconds given to a day run under a timeout, on top of the timeouts of its stages, before its process is killed
+KILL_GRACE = 10
+
+
+@dataclasses.dataclass
+class RunOptions:
+    """How the days are to be run. Shared by every worker"""
+    test: bool = False
+    use_cache: bool = False
+    memory: bool = False
+    profile_dir: str = None
+    sample_hz: int = 0
+    metrics: bool = False  # Whether to collect what the solvers report to lib.metrics
+    gc_mode: str = None  # See lib.gc_probe. Collections are only reported when set
+    gc_thresholds: tuple = None
+    fork_parts: bool = False
+    fused: bool = True  # Whether to prefer solve_both in the days implementing it
+    timeout: float | dict = None  # Seconds per stage, or seconds by stage
+    max_memory: int = None  # Bytes of address space
+
+    @property
+    def limited(self):
+        return bool(self.timeout or self.max_memory)
+
+    @property
+    def probes(self):
+        probes = []
+        if self.profile_dir:
+            probes.append(functools.partial(lib.profile_probe, out_dir=self.profile_dir))
+        if self.sample_hz:
+            probes.append(functools.partial(lib.sampling_probe, hz=self.sample_hz))
+        if self.metrics:
+            probes.append(lib.metrics_probe)
+        if self.gc_mode:
+            probes.append(functools.partial(lib.gc_probe, mode=self.gc_mode, thresholds=self.gc_thresholds))
+        if self.memory:  # Inside the others, not to trace what they allocate. See lib.memory_probe
+            probes.append(lib.memory_probe)
+        if self.limited:  # The last one, so that the limits only cover the stage
+            probes.append(functools.partial(lib.limits_probe, timeout=self.timeout, max_memory=self.max_memory))
+        return tuple(probes)
+
+
+@dataclasses.dataclass
+class DayReport:
+    year: int
+    day: int
+    test: bool = False
+    status: str = 'OK'
+    timings: dict = dataclasses.field(default_factory=dict)
+    results: dict = dataclasses.field(default_factory=dict)
+    reports: dict = dataclasses.field(default_factory=dict)
+    error: str = ''
+    wall: float = None
+    input_f: Path = None  # Only in batches. See run_batch
+
+    @property
+    def key(self):
+        if self.input_f:
+            return f'{day_key(self.year, self.day)} {self.input_f.name}'
+        return day_key(self.year, self.day, self.test)
+
+    @property
+    def total(self):
+        """Wall time, which is less than the sum of the stages when they overlap"""
+        return self.wall if self.wall is not None else sum(self.timings.values())
+
+
+def day_key(year, day, test=False):
+    return f'{year}/{day:02d}' + (' (test)' if test else '')
+
+
+def discover(selection=None) -> list[Path]:
+    """Finds the day files defining a Problem class. They are parsed, not imported, as legacy days run on import.
+
+    The selection may contain years ('2023') or days ('2023/05')."""
+    day_files = []
+
+    for f in sorted(ROOT.glob('[0-9][0-9][0-9][0-9]/[0-9][0-9].py')):
+        if selection and not {f.parent.name, f'{f.parent.name}/{f.stem}'} & set(selection):
+            continue
+
+        if _defines_problem(f):
+            day_files.append(f)
+
+    return day_files
+
+
+def _defines_problem(f: Path) -> bool:
+    tree = ast.parse(f.read_text(), filename=str(f))
+    return any(isinstance(node, ast.ClassDef) and node.name == 'Problem' for node in tree.body)
+
+
+def day_module_name(f: Path) -> str:
+    """The name day files are imported as, as theirs are not valid module names"""
+    return f'aoc_{f.parent.name}_{f.stem}'
+
+
+def load_problem_class(f: Path) -> type[lib.AOCProblem]:
+    """Imports a day file (once) and returns its Problem class"""
+    module_name = day_module_name(f)
+
+    if (module := sys.modules.get(module_name)) is None:
+        spec = importlib.util.spec_from_file_location(module_name, f)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+
+    problem_cls = getattr(module, 'Problem', None)
+    if not (isinstance(problem_cls, type) and issubclass(problem_cls, lib.AOCProblem)):
+        raise TypeError(f'{f} does not define a lib.AOCProblem subclass named Problem')
+
+    return problem_cls
+
+
+def find_day(day: str) -> Path:
+    """From '2023/05' to the day file"""
+    if not (day_files := discover([day])):
+        raise SystemExit(f'No Problem found for {day}')
+    return day_files[0]
+
+
+@contextlib.contextmanager
+def silenced():
+    """Solvers print freely, which would interleave across workers and skew the timings. What goes through lib.echo is
+    dropped, and whatever is still printed goes to devnull. The arguments of echo are still built, hence the loops
+    echoing on every item check lib.output.enabled first"""
+    with lib.output.using('quiet'), open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def run_day(f: Path, options: RunOptions) -> DayReport:
+    report = DayReport(int(f.parent.name), int(f.stem), options.test)
+
+    try:
+        problem = load_problem_class(f)(test=options.test)
+        problem.use_cache = problem.use_cache or options.use_cache
+
+        if not problem.input_path.exists():
+            report.status = 'NO INPUT'
+            return report
+
+        with silenced():
+            time_start = time.perf_counter()
+            stage_results = problem.run(options.probes, fork_parts=options.fork_parts, fused=options.fused)
+            report.wall = time.perf_counter() - time_start
+
+        _fill_report(report, stage_results)
+
+    except Exception as e:
+        _fail_report(report, e)
+
+    return report
+
+
+def _fill_report(report: DayReport, stage_results: list[lib.StageResult]):
+    for stage_result in stage_results:
+        report.timings[stage_result.stage] = stage_result.elapsed
+        report.reports[stage_result.stage] = stage_result.reports
+        if stage_result.stage == lib.AOCProblem.FUSED_STAGE:
+            report.results['solve1'], report.results['solve2'] = stage_result.result
+        else:
+            report.results[stage_result.stage] = stage_result.result
+
+
+def _fail_report(report: DayReport, e: Exception):
+    if isinstance(e, lib.StageTimeout):
+        report.status = 'TIMEOUT'
+        report.error = str(e)
+    elif isinstance(e, lib.StageOutOfMemory):
+        report.status = 'OOM'
+        report.error = str(e)
+    else:
+        report.status = 'ERROR'
+        report.error = f'{type(e).__name__}: {e}'
+
+
+def run_batch(f: Path, input_fs: list[Path], options: RunOptions) -> tuple[lib.StageResult, list[DayReport]]:
+    """Solves many inputs of a day in this process, one after the other. See lib.AOCProblem.solve_batch"""
+    year, day = int(f.parent.name), int(f.stem)
+
+    with silenced():
+        prepare_result, results = load_problem_class(f).solve_batch(input_fs, options.probes, fused=options.fused)
+
+    reports = []
+    for input_f, stage_results in results.items():
+        reports.append(report := DayReport(year, day, input_f=input_f))
+        if isinstance(stage_results, Exception):
+            _fail_report(report, stage_results)
+        else:
+            _fill_report(report, stage_results)
+
+    return prepare_result, reports
+
+
+def run_day_isolated(f: Path, options: RunOptions) -> DayReport:
+    """run_day in a forked child, which takes the limits of the stages with it when it exits. If the child does not
+    report back in time (SIGALRM cannot interrupt C code, like a huge int operation), it is killed"""
+    if isinstance(options.timeout, dict):
+        deadline = sum(options.timeout.values()) + KILL_GRACE
+    else:
+        deadline = len(lib.AOCProblem.STAGES) * options.timeout + KILL_GRACE if options.timeout else None
+
+    sys.stdout.flush()  # Otherwise the child would print whatever is buffered again
+    read_fd, write_fd = os.pipe()
+
+    if not (pid := os.fork()):
+        os.setpgid(0, 0)  # Its own process group, killed as a whole with the processes it forks, like parallel_map's
+        os.close(read_fd)
+        try:
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pickle.dump(run_day(f, options), pipe, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            os._exit(0)
+
+    os.setpgid(pid, pid)  # As well as the child, not to race it to killpg
+    os.close(write_fd)
+
+    report = None
+    try:
+        with os.fdopen(read_fd, 'rb') as pipe:
+            if select.select([pipe], [], [], deadline)[0]:
+                try:
+                    report = pickle.load(pipe)
+                except EOFError:
+                    pass
+            else:
+                os.killpg(pid, signal.SIGKILL)
+                report = DayReport(int(f.parent.name), int(f.stem), options.test, status='TIMEOUT',
+                                   error=f'Killed after not finishing in {deadline} s')
+    except BaseException:
+        os.killpg(pid, signal.SIGKILL)  # Out of the group of the terminal, Ctrl+C does not reach it
+        raise
+    finally:
+        _, status = os.waitpid(pid, 0)
+
+    if report is None:
+        report = DayReport(int(f.parent.name), int(f.stem), options.test, status='ERROR',
+                           error=f'The process died without a report. Exit code {os.waitstatus_to_exitcode(status)}')
+
+    return report
+
+
+def _load_estimates() -> dict:
+    try:
+        with TIMINGS_F.open() as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_estimates(estimates: dict, reports: list[DayReport]):
+    for report in reports:
+        if report.status == 'OK':
+            estimates[report.key] = report.total
+
+    with TIMINGS_F.open('w') as f:
+        json.dump(estimates, f, indent=2, sort_keys=True)
+
+
+def schedule(day_files: list[Path], test=False) -> list[Path]:
+    """Longest job first, according to the previous runs. Days never run before are assumed to be the longest"""
+    estimates = _load_estimates()
+
+    def estimate(f):
+        return estimates.get(day_key(int(f.parent.name), int(f.stem), test), math.inf)
+
+    return sorted(day_files, key=estimate, reverse=True)
+
+
+def _init_worker():
+    """Days already run in parallel, hence each one gets a single worker for lib.parallel_map unless told otherwise"""
+    os.environ.setdefault('AOC_WORKERS', '1')
+
+
+def run_all(day_files: list[Path], jobs=None, options=RunOptions()) -> list[DayReport]:
+    day_files = schedule(day_files, options.test)
+    run = run_day_isolated if options.limited else run_day
+
+    if jobs == 1:
+        reports = [run(f, options) for f in day_files]
+
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            # The executor hands out work in submission order, hence the scheduling is preserved
+            futures = [executor.submit(run, f, options) for f in day_files]
+            reports = [future.result() for future in futures]
+
+    _save_estimates(_load_estimates(), reports)
+
+    return sorted(reports, key=lambda r: (r.year, r.day))
+
+
+def _fmt_result(result, width=16):
+    s = str(result).replace('\n', ' ').strip()
+    return s if len(s) <= width else s[:width - 1] + '…'
+
+
+def _fmt_timing(report: DayReport, stage: str) -> str:
+    """The time of solve_both goes under solve1, solve2 being marked as fused"""
+    if stage in report.timings:
+        return f'{report.timings[stage]:9.3f}'
+
+    if (fused_elapsed := report.timings.get(lib.AOCProblem.FUSED_STAGE)) is not None:
+        if stage == 'solve1':
+            return f'{fused_elapsed:9.3f}'
+        if stage == 'solve2':
+            return f'{"(fused)":>9}'
+
+    return f'{"-":>9}'
+
+
+def print_table(reports: list[DayReport], wall_time: float, what='days'):
+    stages = lib.AOCProblem.STAGES
+    key_width = max([15, *(len(r.key) for r in reports)])
+
+    header = (f'{"Day":{key_width}} {"Status":8} ' + ' '.join(f'{s:>9}' for s in stages) +
+              f' {"Total":>9}  {"Result 1":16} Result 2')
+    print(header)
+    print('-' * len(header))
+
+    for r in reports:
+        timings = ' '.join(_fmt_timing(r, s) for s in stages)
+        print(f'{r.key:{key_width}} {r.status:8} {timings} {r.total:9.3f}  '
+              f'{_fmt_result(r.results.get("solve1", "")):16} {_fmt_result(r.results.get("solve2", ""))}')
+
+    print('-' * len(header))
+    print(f'{len(reports)} {what}. Sum of {what[:-1]} times: {sum(r.total for r in reports):.3f} s. '
+          f'Wall time: {wall_time:.3f} s')
+
+    for r in reports:
+        if r.error:
+            print(f'{r.key}: {r.error}')
+
+
+def print_stage_reports(reports: list[DayReport]):
+    for r in reports:
+        for stage, stage_reports in r.reports.items():
+            if memory_report := stage_reports.get('memory'):
+                print(f'{r.key} {stage} memory:')
+                print(lib.format_memory_report(memory_report))
+            if profile_report := stage_reports.get('profile'):
+                print(f'{r.key} {stage} profile:')
+                print(lib.format_profile_report(profile_report))
+            if sampling_report := stage_reports.get('sampling'):
+                print(f'{r.key} {stage} sampled profile:')
+                print(lib.format_sampling_report(sampling_report))
+            if (metrics_report := stage_reports.get('metrics')) and any(metrics_report.values()):
+                print(f'{r.key} {stage} metrics:')
+                print(lib.format_metrics_report(metrics_report))
+            if gc_report := stage_reports.get('gc'):
+                print(f'{r.key} {stage} GC:')
+                print(lib.format_gc_report(gc_report))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('days', nargs='*', help='Years (2023) or days (2023/05) to run. All of them by default')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Number of worker processes')
+    parser.add_argument('-t', '--test', action='store_true', help='Use the test inputs')
+    parser.add_argument('--cache', action='store_true', help='Reuse the state parsed by load_data in previous runs')
+    parser.add_argument('--memory', action='store_true', help='Trace the memory allocated by every stage')
+    parser.add_argument('--profile', action='store_true',
+                        help='Run every stage under cProfile, dumping .pstats and .collapsed files')
+    parser.add_argument('--profile-dir', default=lib.PROFILES_DIR, help='Where to dump the profiles')
+    parser.add_argument('--sample', action='store_true', help='Sample the stack of every stage. Low overhead')
+    parser.add_argument('--sample-hz', type=int, default=97, help='Samples per second of CPU time')
+    parser.add_argument('--metrics', action='store_true', help='Print what the solvers report to lib.metrics')
+    parser.add_argument('--gc', choices=lib.GC_MODES,
+                        help='Run the garbage collector as usual, disabled or frozen during every stage, reporting its '
+                             'collections and their time')
+    parser.add_argument('--gc-thresholds', type=int, nargs=3, metavar=('GEN0', 'GEN1', 'GEN2'),
+                        help='Thresholds of the garbage collector during every stage. Implies --gc default')
+    parser.add_argument('--fork-parts', action='store_true',
+                        help='After loading, solve both parts at once in forked processes')
+    parser.add_argument('--no-fuse', action='store_true',
+                        help='Run the stages one by one even in the days that solve both parts in a single read')
+    parser.add_argument('--timeout', type=float, help='Seconds of wall-clock time per stage. Reported as TIMEOUT')
+    parser.add_argument('--max-memory', type=int, metavar='MIB',
+                        help='Address space of each day process, in MiB. Reported as OOM')
+    parser.add_argument('--inputs', type=Path, nargs='+', metavar='INPUT',
+                        help='Solve these inputs of a single day, one after the other in a single process')
+    args = parser.parse_args(argv)
+
+    day_files = discover(args.days)
+    options = RunOptions(test=args.test, use_cache=args.cache, memory=args.memory,
+                         profile_dir=args.profile_dir if args.profile else None,
+                         sample_hz=args.sample_hz if args.sample else 0, metrics=args.metrics,
+                         gc_mode=args.gc or ('default' if args.gc_thresholds else None),
+                         gc_thresholds=tuple(args.gc_thresholds) if args.gc_thresholds else None,
+                         fork_parts=args.fork_parts, fused=not args.no_fuse,
+                         timeout=args.timeout, max_memory=args.max_memory * 2 ** 20 if args.max_memory else None)
+
+    time_start = time.perf_counter()
+    if args.inputs:
+        if len(day_files) != 1:
+            parser.error('--inputs needs a single day')
+
+        prepare_result, reports = run_batch(day_files[0], args.inputs, options)
+        time_end = time.perf_counter()
+
+        print_table(reports, time_end - time_start, what='inputs')
+        print(f'Prepared the batch in {prepare_result.elapsed:.3f} s')
+
+    else:
+        reports = run_all(day_files, jobs=args.jobs, options=options)
+        time_end = time.perf_counter()
+
+        print_table(reports, time_end - time_start)
+
+    print_stage_reports(reports)
+
+    return 1 if any(r.status not in ('OK', 'NO INPUT') for r in reports) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+""" Long-lived server keeping the day modules imported and their inputs loaded and precomputed, for fast reruns while
+iterating on a solver. Every run solves a forked copy of the warm instance, hence it is never altered by the solvers.
+Day modules are imported again (and their inputs loaded again) when their source or input changes, and all of them
+when lib does.
+
+    python server.py --serve &          # Listens on .server.sock
+    python server.py 2023/05 -p 2 -t   # Part 2 of 2023/05 on the test input, through the server
+    python server.py --stop
+"""
+
+import argparse
+import importlib
+import json
+import os
+import pickle
+import socket
+import socketserver
+import sys
+import time
+import traceback
+
+from pathlib import Path
+
+import lib
+import runner
+
+SOCKET_F = runner.ROOT / '.server.sock'
+
+# Stages run once per day and input, whose products every run reuses
+WARM_STAGES = ('load_data', 'precompute')
+
+
+def _mtime(f: Path):
+    try:
+        return f.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class WarmDay:
+    """A day instance with its warm stages run, and what it depends on, to tell when it goes stale"""
+
+    def __init__(self, problem: lib.AOCProblem, day_f: Path):
+        self.problem = problem
+        self.day_f = day_f
+        self.mtimes = self._current_mtimes()
+
+    def _current_mtimes(self):
+        return _mtime(self.day_f), _mtime(self.problem.input_path)
+
+    @property
+    def stale(self):
+        return self.mtimes != self._current_mtimes()
+
+
+def solve_forked(problem: lib.AOCProblem, stages: list[str]) -> list[lib.StageResult]:
+    """Runs the stages, in order, in a forked copy of the problem"""
+    read_fd, write_fd = os.pipe()
+
+    if not (pid := os.fork()):
+        os.close(read_fd)
+        try:
+            try:
+                with runner.silenced():
+                    payload = [problem.run_stage(stage) for stage in stages]
+            except BaseException:
+                payload = traceback.format_exc()  # Exceptions may not be picklable
+
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pickle.dump(payload, pipe, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as pipe:
+        try:
+            payload = pickle.load(pipe)
+        except EOFError:
+            payload = None
+    _, status = os.waitpid(pid, 0)
+
+    if payload is None:
+        payload = f'The process died without a result. Exit code {os.waitstatus_to_exitcode(status)}'
+    if isinstance(payload, str):
+        raise RuntimeError(payload)
+
+    return payload
+
+
+class Server(socketserver.UnixStreamServer):
+    """Serves one request at a time, as the runs are meant to be timed"""
+
+    def __init__(self, socket_f=SOCKET_F):
+        self.warm_days = {}
+        self.lib_mtime = _mtime(Path(lib.__file__))
+        self.stopping = False
+
+        Path(socket_f).unlink(missing_ok=True)
+        super().__init__(str(socket_f), RequestHandler)
+
+    def serve(self):
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            self.server_close()
+            Path(self.server_address).unlink(missing_ok=True)
+
+    def _reload_lib_if_changed(self):
+        if (lib_mtime := _mtime(Path(lib.__file__))) == self.lib_mtime:
+            return
+
+        # Every day module subclasses the classes of the previous lib, hence they are imported again too
+        for module_name in [name for name in sys.modules if name.startswith('aoc_')]:
+            del sys.modules[module_name]
+        self.warm_days.clear()
+
+        importlib.reload(lib)
+        self.lib_mtime = lib_mtime
+
+    def warm_day(self, day_f: Path, test: bool) -> tuple[WarmDay, list[lib.StageResult]]:
+        """The warm instance of a day, and the results of its warm stages if they had to be run now"""
+        self._reload_lib_if_changed()
+
+        key = (day_f, test)
+        if (warm_day := self.warm_days.get(key)) and not warm_day.stale:
+            return warm_day, []
+
+        if warm_day and warm_day.mtimes[0] != _mtime(day_f):
+            sys.modules.pop(runner.day_module_name(day_f), None)
+        self.warm_days.pop(key, None)
+
+        problem = runner.load_problem_class(day_f)(test=test)
+        if not problem.input_path.exists():
+            raise FileNotFoundError(f'No input at {problem.input_path}')
+
+        with runner.silenced():
+            stage_results = [problem.run_stage(stage) for stage in WARM_STAGES]
+
+        self.warm_days[key] = warm_day = WarmDay(problem, day_f)
+        return warm_day, stage_results
+
+    def run(self, day: str, parts=(1, 2), test=False) -> dict:
+        day_f = runner.find_day(day)
+        warm_day, stage_results = self.warm_day(day_f, test)
+
+        stages = [f'solve{part}' for part in sorted(set(parts))]
+
+        stage_results.extend(solve_forked(warm_day.problem, stages))
+
+        return {
+            'warm': len(stage_results) == len(stages),
+            'timings': {r.stage: r.elapsed for r in stage_results},
+            'results': {r.stage: r.result for r in stage_results},
+        }
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line, answered by one JSON line:
+
+        {"day": "2023/05", "parts": [2], "test": true} -> {"status": "OK", "warm": true, "timings": ..., "results": ...}
+        {"stop": true} -> {"status": "STOPPED"}
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            request = json.loads(line)
+
+            if request.get('stop'):
+                self.server.stopping = True
+                response = {'status': 'STOPPED'}
+            else:
+                try:
+                    response = {'status': 'OK'} | self.server.run(request['day'], request.get('parts', (1, 2)),
+                                                                  request.get('test', False))
+                except (Exception, SystemExit) as e:  # find_day exits if there is no such day
+                    response = {'status': 'ERROR', 'error': f'{type(e).__name__}: {e}'}
+
+            self.wfile.write(json.dumps(response, default=str).encode() + b'\n')
+
+            if self.server.stopping:
+                return
+
+
+def request(message: dict, socket_f=SOCKET_F) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_f))
+        sock.sendall(json.dumps(message).encode() + b'\n')
+
+        with sock.makefile('rb') as f_in:
+            return json.loads(f_in.readline())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('day', nargs='?', help='Day to run, e.g. 2023/05')
+    parser.add_argument('-p', '--parts', type=int, nargs='+', choices=(1, 2), default=[1, 2])
+    parser.add_argument('-t', '--test', action='store_true', help='Use the test input')
+    parser.add_argument('--socket', type=Path, default=SOCKET_F)
+    parser.add_argument('--serve', action='store_true', help='Start the server')
+    parser.add_argument('--stop', action='store_true', help='Stop the server')
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        print(f'Listening on {args.socket}')
+        Server(args.socket).serve()
+        return 0
+
+    if args.stop:
+        request({'stop': True}, args.socket)
+        return 0
+
+    if not args.day:
+        parser.error('A day is needed unless serving or stopping')
+
+    time_start = time.perf_counter()
+    response = request({'day': args.day, 'parts': args.parts, 'test': args.test}, args.socket)
+    time_end = time.perf_counter()
+
+    if response['status'] != 'OK':
+        print(response['error'])
+        return 1
+
+    for stage, result in response['results'].items():
+        result_str = '' if stage in WARM_STAGES else f' = {result}'
+        print(f'{stage}{result_str}. Time elapsed: {response["timings"][stage]:.3f} s')
+
+    print(f'{"Warm" if response["warm"] else "Cold"} run. Round trip: {time_end - time_start:.3f} s')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The modules of the repo live at its root, and are run from there
+sys.path.insert(0, str(Path(__file__).parent.parent))
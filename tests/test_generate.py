@@ -0,0 +1,16 @@
+import pytest
+
+import generate
+import runner
+
+
+@pytest.mark.parametrize('day', sorted(generate.GENERATORS))
+def test_generated_inputs_are_solved(day, tmp_path):
+    """The inputs of every generator are parsed and solved by its day, small enough to be quick"""
+    f = tmp_path / 'input.txt'
+    f.write_text(generate.generate(day, scale=0.02))
+
+    problem = generate.problem_for(runner.load_problem_class(runner.find_day(day)), f)
+    stage_results = generate.solve(problem, timeout=10)
+
+    assert stage_results and all(stage_result.elapsed is not None for stage_result in stage_results)
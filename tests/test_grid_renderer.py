@@ -0,0 +1,18 @@
+import lib
+
+
+def test_redraw_writes_only_the_changed_cells():
+    renderer = lib.GridRenderer()
+
+    first = renderer.redraw(['...', '.O.', '...'])
+    assert first.startswith(lib.GridRenderer.CLEAR)
+
+    # The rock rolls one cell up: two cells change, at row 1 column 2 and row 2 column 2 (1-based)
+    assert renderer.redraw(['.O.', '...', '...']) == '\x1b[1;2HO\x1b[2;2H.\x1b[4;1H'
+
+
+def test_redraw_of_a_different_height_draws_it_all():
+    renderer = lib.GridRenderer()
+    renderer.redraw(['..', '..'])
+
+    assert renderer.redraw(['..']) == lib.GridRenderer.CLEAR + '..\n'
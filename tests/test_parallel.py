@@ -0,0 +1,64 @@
+import lib
+import runner
+
+# The example of https://adventofcode.com/2023/day/16
+CONTRAPTION = r"""
+.|...\....
+|.-.\.....
+.....|-...
+........|.
+..........
+.........\
+..../.\\..
+.-.-/..|..
+.|....-|.\
+..//.|....
+""".lstrip()
+
+
+def _count_and_square(n: int) -> int:
+    lib.metrics.count('items')
+    lib.metrics.observe('n', n)
+    lib.metrics.gauge('last n', n)
+    return n * n
+
+
+def _metrics_of(func, items, workers: int, backend='process') -> tuple[list, dict]:
+    with lib.metrics_probe(None, 'solve1') as report:
+        results = lib.parallel_map(func, items, workers=workers, backend=backend)
+    return results, report
+
+
+def test_process_workers_report_their_metrics():
+    serial = _metrics_of(_count_and_square, range(1, 100), workers=1)
+    parallel = _metrics_of(_count_and_square, range(1, 100), workers=2)
+
+    assert serial[1]['counters'] == {'items': 99}
+    assert parallel == serial
+
+
+def test_thread_workers_do_not_lose_updates():
+    serial = _metrics_of(_count_and_square, range(1, 10_000), workers=1)
+    threaded = _metrics_of(_count_and_square, range(1, 10_000), workers=4, backend='thread')
+
+    # Which thread sets a gauge last is down to the scheduler
+    assert threaded[0] == serial[0]
+    assert threaded[1]['counters'] == serial[1]['counters']
+    assert threaded[1]['histograms'] == serial[1]['histograms']
+
+
+def test_day_metrics_do_not_depend_on_the_workers(tmp_path, monkeypatch):
+    input_f = tmp_path / '16.txt'
+    input_f.write_text(CONTRAPTION)
+    problem_cls = runner.load_problem_class(runner.ROOT / '2023' / '16.py')
+
+    reports = {}
+    for workers in ('1', '2'):
+        monkeypatch.setenv('AOC_WORKERS', workers)
+        problem = problem_cls()
+        problem.input_f = input_f
+        results = problem.run(probes=(lib.metrics_probe,), fused=False)
+        reports[workers] = [(r.stage, r.result, r.reports['metrics']) for r in results]
+
+    assert reports['1'] == reports['2']
+    assert reports['2'][-1][2]['counters']['states popped'] > 0